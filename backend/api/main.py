@@ -690,6 +690,16 @@ async def startup_event():
             else:
                 print("ℹ️  Delivery worker disabled (ENABLE_DELIVERY_WORKER=false)")
 
+        # Build the shared Fixion chat client before serving requests, so the
+        # first concurrent chats don't each construct their own
+        if getattr(config, 'ANTHROPIC_API_KEY', None):
+            try:
+                from backend.fixion.service import get_fixion_llm
+                get_fixion_llm()
+                print("✓ Fixion chat client ready")
+            except Exception as e:
+                print(f"⚠️  Error warming Fixion chat client: {e}")
+
         # Validate world templates exist (no longer using RAG)
         try:
             from pathlib import Path
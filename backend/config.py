@@ -274,6 +274,18 @@ class AppConfig(BaseSettings):
         description="Maximum tokens per LLM response (16000 = ~10K-12K words, ensures 2500-word chapters + JSON structure never get truncated)"
     )
 
+    ANTHROPIC_MAX_CONCURRENCY: int = Field(
+        default=32,
+        ge=1,
+        description="Maximum concurrent Fixion chat calls to Anthropic per process (excess calls wait)"
+    )
+
+    STORY_WORKER_CONCURRENCY: int = Field(
+        default=2,
+        ge=1,
+        description="Maximum story generation jobs the in-process worker runs at once"
+    )
+
     # ===== Feature Toggles (for phased development) =====
     ENABLE_STREAMING: bool = Field(
         default=True,
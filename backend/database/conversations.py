@@ -6,7 +6,7 @@ context management, and conversation lifecycle.
 """
 
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from uuid import UUID, uuid4
 
 from supabase import Client
@@ -175,34 +175,57 @@ class ConversationService:
         Returns:
             Updated conversation data
         """
-        if role not in ("user", "assistant"):
-            raise ValueError("Role must be 'user' or 'assistant'")
+        return await self.add_messages(
+            conversation_id, [(role, content)], metadata=metadata
+        )
+
+    async def add_messages(
+        self,
+        conversation_id: UUID | str,
+        messages: List[Tuple[str, str]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Append several messages to a conversation in one update.
+
+        Args:
+            conversation_id: Conversation ID
+            messages: (role, content) pairs in the order they were said
+            metadata: Optional metadata attached to each message
+
+        Returns:
+            Updated conversation data
+        """
+        for role, _ in messages:
+            if role not in ("user", "assistant"):
+                raise ValueError("Role must be 'user' or 'assistant'")
 
         # Get current conversation
         conversation = await self.get_by_id(conversation_id)
         if not conversation:
             raise ConversationNotFoundError(f"Conversation {conversation_id} not found")
 
-        # Build new message
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-        if metadata:
-            message["metadata"] = metadata
+        now = datetime.now(timezone.utc).isoformat()
 
         # Append to messages array
-        messages = conversation.get("messages", [])
-        messages.append(message)
+        history = conversation.get("messages", [])
+        for role, content in messages:
+            message = {
+                "role": role,
+                "content": content,
+                "timestamp": now,
+            }
+            if metadata:
+                message["metadata"] = metadata
+            history.append(message)
 
         # Update conversation
         result = (
             self.client.table("conversations")
             .update({
-                "messages": messages,
-                "message_count": len(messages),
-                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "messages": history,
+                "message_count": len(history),
+                "updated_at": now,
             })
             .eq("id", str(conversation_id))
             .execute()
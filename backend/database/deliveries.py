@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any, List
 from uuid import UUID
 from enum import Enum
 
+from postgrest.exceptions import APIError
 from supabase import Client
 
 from .client import get_supabase_admin_client
@@ -69,6 +70,30 @@ class DeliveryService:
         story_id_str = str(story_id)
         user_id_str = str(user_id)
 
+        delivery_data = {
+            "story_id": story_id_str,
+            "user_id": user_id_str,
+            "user_email": user_email,
+            "deliver_at": deliver_at.isoformat(),
+            "timezone": timezone_str,
+            "status": DeliveryStatus.PENDING.value,
+        }
+
+        # Insert unless the story already has a delivery (unique_story_delivery,
+        # e.g. on job recovery): one round-trip in the common case
+        try:
+            result = (
+                self.client.table("scheduled_deliveries")
+                .upsert(delivery_data, on_conflict="story_id", ignore_duplicates=True)
+                .execute()
+            )
+            if result.data:
+                return result.data[0]
+        except APIError:
+            # Databases without unique_story_delivery reject ON CONFLICT;
+            # fall back to check-then-insert
+            pass
+
         # Check if delivery already exists for this story (prevents duplicates on job recovery)
         existing = (
             self.client.table("scheduled_deliveries")
@@ -81,15 +106,6 @@ class DeliveryService:
             # Delivery already exists - return it instead of creating duplicate
             return existing.data[0]
 
-        delivery_data = {
-            "story_id": story_id_str,
-            "user_id": user_id_str,
-            "user_email": user_email,
-            "deliver_at": deliver_at.isoformat(),
-            "timezone": timezone_str,
-            "status": DeliveryStatus.PENDING.value,
-        }
-
         result = self.client.table("scheduled_deliveries").insert(delivery_data).execute()
         return result.data[0]
 
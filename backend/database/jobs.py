@@ -6,7 +6,7 @@ Replaces the SQLite-based StoryJobDatabase.
 """
 
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set
 from uuid import UUID, uuid4
 from enum import Enum
 
@@ -14,6 +14,11 @@ from supabase import Client
 
 from .client import get_supabase_admin_client
 
+# User ids per in_() filter. The ids go in the GET query string (~38 bytes
+# each once encoded), so larger chunks risk the ~8 KB request-line limit of
+# proxies in front of PostgREST.
+_USER_ID_CHUNK_SIZE = 100
+
 
 class JobStatus(str, Enum):
     """Status values for story generation jobs"""
@@ -116,6 +121,40 @@ class JobQueueService:
         result = self.client.table("story_jobs").insert(job_data).execute()
         return result.data[0]
 
+    async def create_jobs_batch(
+        self, jobs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several story generation jobs with a single insert.
+
+        Each entry takes the same fields as create_job (job_id, story_bible,
+        user_email, settings, user_id). Unlike create_job, no per-user
+        duplicate check is made; callers are expected to have filtered out
+        users with active or completed-today jobs already.
+
+        Returns:
+            Created job rows
+        """
+        if not jobs:
+            return []
+
+        created_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            {
+                "job_id": job["job_id"],
+                "story_bible": job["story_bible"],
+                "user_email": job["user_email"],
+                "settings": job.get("settings"),
+                "user_id": str(job["user_id"]) if job.get("user_id") else None,
+                "status": JobStatus.PENDING.value,
+                "created_at": created_at,
+            }
+            for job in jobs
+        ]
+
+        result = self.client.table("story_jobs").insert(rows).execute()
+        return result.data
+
     # =========================================================================
     # Job Retrieval
     # =========================================================================
@@ -130,6 +169,21 @@ class JobQueueService:
         )
         return result.data[0] if result.data else None
 
+    async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get just the status/progress fields of a job.
+
+        For status polling: skips the story_bible and result payloads that
+        get_job_by_id returns.
+        """
+        result = (
+            self.client.table("story_jobs")
+            .select("job_id, status, current_step, progress_percent, error_message, created_at, started_at, completed_at, generation_time_seconds")
+            .eq("job_id", job_id)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
     async def get_pending_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get pending jobs ordered by creation time (FIFO)."""
         result = (
@@ -142,6 +196,30 @@ class JobQueueService:
         )
         return result.data
 
+    async def claim_pending_batch(self, worker_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to `limit` pending jobs (oldest first) in one round-trip.
+
+        Backed by the claim_pending_jobs database function (FOR UPDATE SKIP
+        LOCKED), so fetching and marking happen in one round-trip and
+        concurrent workers never claim the same job.
+        """
+        result = self.client.rpc(
+            "claim_pending_jobs",
+            {"worker_id": worker_id, "batch_size": limit}
+        ).execute()
+        return result.data or []
+
+    async def count_pending(self) -> int:
+        """Count pending jobs without fetching them."""
+        result = (
+            self.client.table("story_jobs")
+            .select("id", count="exact", head=True)
+            .eq("status", JobStatus.PENDING.value)
+            .execute()
+        )
+        return result.count or 0
+
     async def get_recent_jobs(
         self,
         email: Optional[str] = None,
@@ -198,6 +276,47 @@ class JobQueueService:
         )
         return result.data
 
+    async def get_users_with_active_jobs(self, user_ids: List[str]) -> Set[str]:
+        """
+        Get which of the given users have a pending/running job.
+
+        One query per chunk of ids instead of one per user; used by the
+        daily scheduler to skip users whose story is already in progress.
+        """
+        active: Set[str] = set()
+        for i in range(0, len(user_ids), _USER_ID_CHUNK_SIZE):
+            result = (
+                self.client.table("story_jobs")
+                .select("user_id")
+                .in_("user_id", user_ids[i:i + _USER_ID_CHUNK_SIZE])
+                .in_("status", [JobStatus.PENDING.value, JobStatus.RUNNING.value])
+                .execute()
+            )
+            active.update(row["user_id"] for row in result.data)
+        return active
+
+    async def get_users_with_completed_jobs_since(
+        self, user_ids: List[str], since: datetime
+    ) -> Set[str]:
+        """
+        Get which of the given users have a job completed that was created at
+        or after `since`.
+
+        Batch form of create_job's "completed daily job today" check.
+        """
+        completed: Set[str] = set()
+        for i in range(0, len(user_ids), _USER_ID_CHUNK_SIZE):
+            result = (
+                self.client.table("story_jobs")
+                .select("user_id")
+                .in_("user_id", user_ids[i:i + _USER_ID_CHUNK_SIZE])
+                .eq("status", JobStatus.COMPLETED.value)
+                .gte("created_at", since.isoformat())
+                .execute()
+            )
+            completed.update(row["user_id"] for row in result.data)
+        return completed
+
     # =========================================================================
     # Job Status Updates
     # =========================================================================
@@ -295,14 +414,23 @@ class JobQueueService:
         self,
         job_id: str,
         error_message: str,
-        should_retry: bool = False
+        should_retry: bool = False,
+        settings: Optional[Dict[str, Any]] = None,
+        result: Optional[Dict[str, Any]] = None,
+        story_id: Optional[UUID | str] = None
     ) -> Dict[str, Any]:
-        """Mark a job as failed."""
+        """
+        Mark a job as failed.
+
+        settings/result/story_id, if given, are stored on the job either way
+        (the worker uses them to retry only the delivery of a saved story).
+        """
         if should_retry:
             # Get current retry count and increment
             job = await self.get_job_by_id(job_id)
             new_retry_count = (job.get("retry_count", 0) if job else 0) + 1
 
+        if should_retry and new_retry_count < 3:
             update_data = {
                 "status": JobStatus.PENDING.value,
                 "error_message": error_message,
@@ -311,19 +439,27 @@ class JobQueueService:
                 "progress_percent": 0,
             }
         else:
+            # claim_pending_jobs skips jobs with retry_count >= 3, so fail them here
             update_data = {
                 "status": JobStatus.FAILED.value,
                 "error_message": error_message,
                 "completed_at": datetime.now(timezone.utc).isoformat(),
             }
 
-        result = (
+        if settings is not None:
+            update_data["settings"] = settings
+        if result is not None:
+            update_data["result"] = result
+        if story_id:
+            update_data["story_id"] = str(story_id)
+
+        db_result = (
             self.client.table("story_jobs")
             .update(update_data)
             .eq("job_id", job_id)
             .execute()
         )
-        return result.data[0] if result.data else None
+        return db_result.data[0] if db_result.data else None
 
     # =========================================================================
     # Job Recovery
@@ -335,13 +335,15 @@ class UserService:
         Returns:
             List of users who need stories generated
         """
-        # This will be used by the story scheduler
-        # For now, get all active users who haven't received a story today
+        # Used by the daily story scheduler. Users without credits can't get
+        # a story, so they're filtered here; whether one was already sent
+        # "today" depends on each user's timezone and is checked by the caller.
         result = (
             self.client.table("users")
             .select("*")
             .in_("subscription_status", ["active", "trial"])
             .eq("onboarding_completed", True)
+            .gte("credits", 1)
             .execute()
         )
         return result.data
@@ -20,6 +20,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from backend.database.deliveries import DeliveryService, DeliveryStatus
 from backend.database.stories import StoryService
 from backend.utils.logging import get_logger
+from backend.utils.retry import is_retryable_error
 
 logger = get_logger("delivery_worker")
 
@@ -180,9 +181,7 @@ class DeliveryWorker:
                 should_retry = False
             else:
                 # Determine if retryable based on error type
-                should_retry = any(x in error_msg.lower() for x in [
-                    "timeout", "rate limit", "429", "503", "502", "connection"
-                ])
+                should_retry = is_retryable_error(error_msg)
 
             try:
                 await self.delivery_service.mark_failed(
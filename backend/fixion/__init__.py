@@ -7,10 +7,11 @@ Fixion takes on genre-specific personas when helping users.
 """
 
 from .service import FixionService
-from .prompts import get_fixion_system_prompt, FIXION_PERSONAS
+from .prompts import get_fixion_system_prompt, resolve_genre, FIXION_PERSONAS
 
 __all__ = [
     "FixionService",
     "get_fixion_system_prompt",
+    "resolve_genre",
     "FIXION_PERSONAS",
 ]
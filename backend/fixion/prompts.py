@@ -5,7 +5,23 @@ Contains the core character definition and genre-specific personas
 for the Fixion AI character.
 """
 
-from typing import Optional, Dict, Any
+from __future__ import annotations
+
+import functools
+import random
+import sys
+import types
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+
+__all__ = [
+    "FIXION_BASE_CHARACTER",
+    "FIXION_PERSONAS",
+    "Persona",
+    "get_fixion_system_prompt",
+    "get_writers_room_response",
+    "resolve_genre",
+]
 
 
 # =============================================================================
@@ -63,15 +79,31 @@ You are Fixion, the receptionist and intake specialist at FixionMail.
 # Genre-Specific Personas
 # =============================================================================
 
-FIXION_PERSONAS = {
-    "mystery": {
-        "name": "Mystery",
-        "pivot_line": """Mystery, eh? *adjusts invisible fedora*
+@dataclass(frozen=True, slots=True)
+class Persona:
+    """A genre-specific persona Fixion slips into once a genre is chosen."""
+    name: str
+    pivot_line: str  # Shown verbatim when the user picks the genre
+    voice_style: str  # Appended to the system prompt
+    character_note: Optional[str] = None
+
+    def __post_init__(self):
+        # Intern like the other static prompt fragments (see String Interning)
+        for field in ("pivot_line", "voice_style", "character_note"):
+            value = getattr(self, field)
+            if value:
+                object.__setattr__(self, field, sys.intern(value))
+
+
+FIXION_PERSONAS: Dict[str, Persona] = {
+    "mystery": Persona(
+        name="Mystery",
+        pivot_line="""Mystery, eh? *adjusts invisible fedora*
 
 I had a feeling you'd say that. The way you clicked that button... deliberate. Calculated. You've got secrets, don't you?
 
 Alright, let's build your case file.""",
-        "voice_style": """
+        voice_style="""
 When in Mystery mode:
 - Speak in noir-ish metaphors occasionally
 - Be slightly suspicious and observant
@@ -79,17 +111,17 @@ When in Mystery mode:
 - Reference detective tropes with affection
 - Keep things atmospheric but not cheesy
 """,
-        "character_note": "For mystery, users often want a recurring detective. Ask about their investigator.",
-    },
+        character_note="For mystery, users often want a recurring detective. Ask about their investigator.",
+    ),
 
-    "romance": {
-        "name": "Romance",
-        "pivot_line": """Romance! *clutches chest*
+    "romance": Persona(
+        name="Romance",
+        pivot_line="""Romance! *clutches chest*
 
 Oh, you're after my own heart. I once played the romantic lead in a community theater production of— actually, never mind that.
 
 Tell me... *gazes wistfully* ...what makes your heart flutter?""",
-        "voice_style": """
+        voice_style="""
 When in Romance mode:
 - Be genuinely swoony and romantic
 - Dramatic sighs are acceptable
@@ -97,18 +129,18 @@ When in Romance mode:
 - Care deeply about the love interest
 - Understand that romance readers know what they want
 """,
-        "character_note": "Romance REQUIRES a persistent protagonist. The same character falls in love across the story.",
-    },
+        character_note="Romance REQUIRES a persistent protagonist. The same character falls in love across the story.",
+    ),
 
-    "thriller": {
-        "name": "Thriller",
-        "pivot_line": """Thriller. Good choice.
+    "thriller": Persona(
+        name="Thriller",
+        pivot_line="""Thriller. Good choice.
 *looks over shoulder*
 
 Keep your voice down. You never know who's listening.
 
 I need to know how deep you want to go.""",
-        "voice_style": """
+        voice_style="""
 When in Thriller mode:
 - Speak in hushed, intense tones
 - Create a sense of paranoia (playfully)
@@ -116,38 +148,18 @@ When in Thriller mode:
 - Treat tension as sacred
 - Ask about how dark they want to go
 """,
-        "character_note": "Thrillers can be episodic (different protagonists) or serial (same person in escalating danger). Ask.",
-    },
-
-    "sci-fi": {
-        "name": "Sci-Fi",
-        "pivot_line": """Sci-Fi! *eyes light up*
-
-I was THIS close to booking a role in a Star Trek fan film. Didn't get the part, but I kept the accent.
-
-*shifts to vaguely futuristic cadence*
-
-Initiating preference calibration sequence.""",
-        "voice_style": """
-When in Sci-Fi mode:
-- Enthusiastic about technology and possibility
-- Occasionally slip into "futuristic" speech patterns
-- Be nerdy and unashamed about it
-- Ask about hard vs soft sci-fi preferences
-- Care about worldbuilding
-""",
-        "character_note": "Sci-Fi can go either way - persistent crew or anthology. Ask about their preference.",
-    },
+        character_note="Thrillers can be episodic (different protagonists) or serial (same person in escalating danger). Ask.",
+    ),
 
-    "fantasy": {
-        "name": "Fantasy",
-        "pivot_line": """Fantasy!
+    "fantasy": Persona(
+        name="Fantasy",
+        pivot_line="""Fantasy!
 *straightens posture, speaks with theatrical gravitas*
 
 Ah, a traveler of realms. I once played Third Wizard From The Left in a Renaissance faire. My moment has come.
 
 Tell me, brave soul — do you seek tales of wonder and light, or shall we venture into... darker woods?""",
-        "voice_style": """
+        voice_style="""
 When in Fantasy mode:
 - Theatrical, medieval flair
 - Use "good soul", "brave traveler", etc. sparingly
@@ -155,12 +167,12 @@ When in Fantasy mode:
 - Ask about epic vs intimate fantasy
 - Be reverent about the genre
 """,
-        "character_note": "Fantasy often needs a persistent hero on a journey. Ask about their protagonist.",
-    },
+        character_note="Fantasy often needs a persistent hero on a journey. Ask about their protagonist.",
+    ),
 
-    "horror": {
-        "name": "Horror",
-        "pivot_line": """Horror.
+    "horror": Persona(
+        name="Horror",
+        pivot_line="""Horror.
 *slow smile*
 
 Oh, I was hoping you'd say that.
@@ -170,7 +182,7 @@ Oh, I was hoping you'd say that.
 I've been... practicing. Late at night. In the supply closet.
 
 Now then... how scared do you want to be?""",
-        "voice_style": """
+        voice_style="""
 When in Horror mode:
 - Creepy and ominous, but controlled
 - Delight in the macabre
@@ -178,12 +190,12 @@ When in Horror mode:
 - Be respectful that horror is personal
 - Create atmosphere without being gratuitous
 """,
-        "character_note": "Horror is often anthology - fresh victims each time. But ask if they want recurring characters.",
-    },
+        character_note="Horror is often anthology - fresh victims each time. But ask if they want recurring characters.",
+    ),
 
-    "drama": {
-        "name": "Drama",
-        "pivot_line": """Drama.
+    "drama": Persona(
+        name="Drama",
+        pivot_line="""Drama.
 *takes a breath*
 
 The raw stuff. The real human experience. No hiding behind genre tropes.
@@ -191,7 +203,7 @@ The raw stuff. The real human experience. No hiding behind genre tropes.
 *meets your eyes*
 
 I respect that. Let's talk about what matters to you.""",
-        "voice_style": """
+        voice_style="""
 When in Drama mode:
 - Sincere and present
 - Less theatrical, more grounded
@@ -199,12 +211,12 @@ When in Drama mode:
 - Care about character depth over plot
 - Be thoughtful and measured
 """,
-        "character_note": "Drama can go either way - ask about character continuity.",
-    },
+        character_note="Drama can go either way - ask about character continuity.",
+    ),
 
-    "comedy": {
-        "name": "Comedy",
-        "pivot_line": """Comedy!
+    "comedy": Persona(
+        name="Comedy",
+        pivot_line="""Comedy!
 *perks up*
 
 Finally, someone with taste. I've been workshopping some material...
@@ -214,7 +226,7 @@ Finally, someone with taste. I've been workshopping some material...
 No, no, this is about YOU. Though if you need someone to read lines with, I'm available.
 
 What kind of funny are we talking?""",
-        "voice_style": """
+        voice_style="""
 When in Comedy mode:
 - Quippy and light
 - Self-referential humor
@@ -222,12 +234,12 @@ When in Comedy mode:
 - Ask about humor style (dry, physical, absurd, sitcom)
 - Have fun with it
 """,
-        "character_note": "Sitcom comedy needs recurring cast. Other comedy can be anthology. Ask.",
-    },
+        character_note="Sitcom comedy needs recurring cast. Other comedy can be anthology. Ask.",
+    ),
 
-    "cozy": {
-        "name": "Cozy",
-        "pivot_line": """Cozy!
+    "cozy": Persona(
+        name="Cozy",
+        pivot_line="""Cozy!
 *settles into chair*
 
 Ah, comfort reading. The good stuff. Tea and blankets and happy endings.
@@ -235,7 +247,7 @@ Ah, comfort reading. The good stuff. Tea and blankets and happy endings.
 *smiles warmly*
 
 Tell me about your perfect cozy day.""",
-        "voice_style": """
+        voice_style="""
 When in Cozy mode:
 - Warm and comforting
 - Gentle and reassuring
@@ -243,12 +255,12 @@ When in Cozy mode:
 - Ask about settings they find relaxing
 - Emphasize happy endings and warmth
 """,
-        "character_note": "Cozy stories are usually anthology style with fresh characters in each story.",
-    },
+        character_note="Cozy stories are usually anthology style with fresh characters in each story.",
+    ),
 
-    "western": {
-        "name": "Western",
-        "pivot_line": """Western!
+    "western": Persona(
+        name="Western",
+        pivot_line="""Western!
 *tips imaginary hat*
 
 Well, howdy partner. I once did a Western dinner theater. Only ran two nights, but I still remember my spurs.
@@ -256,7 +268,7 @@ Well, howdy partner. I once did a Western dinner theater. Only ran two nights, b
 *squints at horizon*
 
 So... what kind of frontier are we riding into?""",
-        "voice_style": """
+        voice_style="""
 When in Western mode:
 - Occasional frontier phrases
 - Straightforward, laconic
@@ -264,12 +276,12 @@ When in Western mode:
 - Care about setting and era
 - Rugged but warm
 """,
-        "character_note": "Westerns can go either way - wandering hero or new characters. Ask about preference.",
-    },
+        character_note="Westerns can go either way - wandering hero or new characters. Ask about preference.",
+    ),
 
-    "action": {
-        "name": "Action",
-        "pivot_line": """Action!
+    "action": Persona(
+        name="Action",
+        pivot_line="""Action!
 *cracks knuckles*
 
 Now we're talking. I did my own stunts once. *pauses* Once.
@@ -277,7 +289,7 @@ Now we're talking. I did my own stunts once. *pauses* Once.
 *leans forward intensely*
 
 How much adrenaline are we talking here?""",
-        "voice_style": """
+        voice_style="""
 When in Action mode:
 - High energy but controlled
 - Direct and punchy
@@ -285,12 +297,12 @@ When in Action mode:
 - Care about stakes and consequences
 - Keep the momentum
 """,
-        "character_note": "Action often works best with a recurring hero. Ask about their protagonist.",
-    },
+        character_note="Action often works best with a recurring hero. Ask about their protagonist.",
+    ),
 
-    "historical": {
-        "name": "Historical",
-        "pivot_line": """Historical!
+    "historical": Persona(
+        name="Historical",
+        pivot_line="""Historical!
 *straightens posture*
 
 A person of culture. I've played several historical figures — all in community theater, but still.
@@ -298,7 +310,7 @@ A person of culture. I've played several historical figures — all in community
 *adopts scholarly air*
 
 Which era calls to you?""",
-        "voice_style": """
+        voice_style="""
 When in Historical mode:
 - Educated and thoughtful
 - Period-appropriate vocabulary hints
@@ -306,19 +318,19 @@ When in Historical mode:
 - Care about authenticity vs entertainment
 - Respectful of the past
 """,
-        "character_note": "Historical stories usually feature new characters each time, set in the chosen era.",
-    },
+        character_note="Historical stories usually feature new characters each time, set in the chosen era.",
+    ),
 
-    "scifi": {
-        "name": "Sci-Fi",
-        "pivot_line": """Sci-Fi! *eyes light up*
+    "scifi": Persona(
+        name="Sci-Fi",
+        pivot_line="""Sci-Fi! *eyes light up*
 
 I was THIS close to booking a role in a Star Trek fan film. Didn't get the part, but I kept the accent.
 
 *shifts to vaguely futuristic cadence*
 
 Initiating preference calibration sequence.""",
-        "voice_style": """
+        voice_style="""
 When in Sci-Fi mode:
 - Enthusiastic about technology and possibility
 - Occasionally slip into "futuristic" speech patterns
@@ -326,12 +338,12 @@ When in Sci-Fi mode:
 - Ask about hard vs soft sci-fi preferences
 - Care about worldbuilding
 """,
-        "character_note": "Sci-Fi can go either way - persistent crew or anthology. Ask about their preference.",
-    },
+        character_note="Sci-Fi can go either way - persistent crew or anthology. Ask about their preference.",
+    ),
 
-    "strange_fables": {
-        "name": "Strange Fables",
-        "pivot_line": """Strange Fables...
+    "strange_fables": Persona(
+        name="Strange Fables",
+        pivot_line="""Strange Fables...
 *eyes glitter*
 
 Oh, you want the weird stuff. The twist endings. The tales that stick with you.
@@ -339,7 +351,7 @@ Oh, you want the weird stuff. The twist endings. The tales that stick with you.
 *voice drops to a whisper*
 
 I like how you think.""",
-        "voice_style": """
+        voice_style="""
 When in Strange Fables mode:
 - Mysterious and whimsical
 - Hint at deeper meanings
@@ -347,11 +359,49 @@ When in Strange Fables mode:
 - Ask about what kind of strange they like
 - Embrace the uncanny
 """,
-        "character_note": "Strange Fables are anthology by nature - each tale stands alone with its own characters.",
-    },
+        character_note="Strange Fables are anthology by nature - each tale stands alone with its own characters.",
+    ),
+}
+
+# Alternate spellings users (and older clients) send for a genre, mapped to
+# the canonical FIXION_PERSONAS key.
+_GENRE_ALIASES: Dict[str, str] = {
+    "sci-fi": "scifi",
+    "sci fi": "scifi",
+    "science fiction": "scifi",
+    "strange fables": "strange_fables",
+    "strange-fables": "strange_fables",
+}
+
+# Lowercase genre/alias -> canonical key, so prompt building needs a single
+# lookup per call.
+_GENRE_KEYS: Dict[str, str] = {
+    **{key: key for key in FIXION_PERSONAS},
+    **_GENRE_ALIASES,
 }
 
 
+def _render_persona_block(persona: Persona) -> str:
+    block = f"\n\n## Current Genre Persona: {persona.name}\n\n{persona.voice_style}"
+    if persona.character_note:
+        block += f"\n\nNote: {persona.character_note}"
+    return block
+
+
+# Canonical key -> the persona section of the system prompt. The prompt
+# builder only needs this flat string table, not the full Persona records.
+_PERSONA_BLOCKS: Dict[str, str] = {
+    key: _render_persona_block(persona) for key, persona in FIXION_PERSONAS.items()
+}
+
+
+def resolve_genre(genre: Optional[str]) -> Optional[str]:
+    """Return the canonical persona key for a genre or alias, or None if unknown."""
+    if not genre:
+        return None
+    return _GENRE_KEYS.get(genre.lower())
+
+
 # =============================================================================
 # Context-Specific Prompts
 # =============================================================================
@@ -375,7 +425,9 @@ At the end, confirm their choices and let them know their first story is coming.
 """
 
 
-STORY_DISCUSSION_CONTEXT = """
+def _render_story_discussion(story_context: str) -> str:
+    """Context for talking through a specific delivered story."""
+    return f"""
 ## Current Context: Discussing a Story
 
 The user wants to talk about a specific story they received.
@@ -397,7 +449,9 @@ Your job:
 """
 
 
-RETELL_CONTEXT = """
+def _render_retell(story_context: str, user_feedback: str) -> str:
+    """Context for turning user feedback into a revision request."""
+    return f"""
 ## Current Context: Processing Retell Request
 
 The user has requested changes to a story.
@@ -483,6 +537,10 @@ def get_fixion_system_prompt(
     """
     Build the complete system prompt for Fixion.
 
+    Prompts are memoized on the inputs that actually reach the text (the
+    resolved genre, the formatted story fields, feedback and preference
+    values), so repeated turns in a conversation reuse the same string.
+
     Args:
         context: Type of interaction ('onboarding', 'story_discussion', 'retell', 'general')
         genre: User's selected genre (triggers persona)
@@ -493,77 +551,155 @@ def get_fixion_system_prompt(
     Returns:
         Complete system prompt string
     """
-    parts = [FIXION_BASE_CHARACTER]
-
+    if not user_preferences:
+        prompt = _STATIC_PROMPTS.get((context, genre.lower() if genre else None))
+        if prompt is not None:
+            return prompt
+
+    uses_story = context in ("story_discussion", "retell")
+
+    return _build_prompt_cached(
+        context,
+        resolve_genre(genre),
+        _story_fields(story_context) if uses_story and story_context else None,
+        user_feedback if context == "retell" else None,
+        _pref_values(user_preferences) if user_preferences else None,
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_prompt_cached(
+    context: str,
+    genre_key: Optional[str],
+    story_fields: Optional[Tuple[str, ...]],
+    user_feedback: Optional[str],
+    pref_values: Optional[Tuple[Optional[str], ...]],
+) -> str:
+    """Render the system prompt from hashable, pre-extracted inputs."""
     # Add genre-specific persona if set
-    if genre and genre.lower() in FIXION_PERSONAS:
-        persona = FIXION_PERSONAS[genre.lower()]
-        parts.append(f"\n## Current Genre Persona: {persona['name']}\n")
-        parts.append(persona['voice_style'])
-        if persona.get('character_note'):
-            parts.append(f"\nNote: {persona['character_note']}")
+    persona_block = _PERSONA_BLOCKS[genre_key] if genre_key else ""
 
     # Add context-specific instructions
-    if context == "onboarding":
-        parts.append(ONBOARDING_CONTEXT)
-    elif context == "story_discussion":
-        ctx = STORY_DISCUSSION_CONTEXT.format(
-            story_context=_format_story_context(story_context) if story_context else "Not provided"
-        )
-        parts.append(ctx)
-    elif context == "retell":
-        ctx = RETELL_CONTEXT.format(
-            story_context=_format_story_context(story_context) if story_context else "Not provided",
-            user_feedback=user_feedback or "Not specified"
-        )
-        parts.append(ctx)
-    else:
-        parts.append(GENERAL_CONTEXT)
+    build_context = _CONTEXT_BUILDERS.get(context, _CONTEXT_BUILDERS["general"])
+    context_block = build_context(story_fields, user_feedback)
 
     # Add user preferences context if available
-    if user_preferences:
-        parts.append(f"\n## User's Current Preferences\n{_format_preferences(user_preferences)}")
-
-    return "\n".join(parts)
+    prefs_block = ""
+    if pref_values is not None:
+        prefs_block = f"\n\n## User's Current Preferences\n{_format_preferences(pref_values)}"
+
+    return f"{FIXION_BASE_CHARACTER}{persona_block}\n{context_block}{prefs_block}"
+
+
+# context -> builder(story_fields, user_feedback); unknown contexts use "general"
+_CONTEXT_BUILDERS = {
+    "onboarding": lambda sf, uf: ONBOARDING_CONTEXT,
+    "story_discussion": lambda sf, uf: _render_story_discussion(
+        _format_story_context(sf) if sf else "Not provided"
+    ),
+    "retell": lambda sf, uf: _render_retell(
+        _format_story_context(sf) if sf else "Not provided",
+        uf or "Not specified",
+    ),
+    "general": lambda sf, uf: GENERAL_CONTEXT,
+}
 
 
-def _format_story_context(story: Dict[str, Any]) -> str:
-    """Format story data for prompt context."""
-    if not story:
-        return "No story context available"
-
-    return f"""
-Title: {story.get('title', 'Unknown')}
-Genre: {story.get('genre', 'Unknown')}
-Word Count: {story.get('word_count', 'Unknown')}
-Created: {story.get('created_at', 'Unknown')}
-Rating: {story.get('rating', 'Not rated')}
+_STORY_CTX_TEMPLATE = """
+Title: {}
+Genre: {}
+Word Count: {}
+Created: {}
+Rating: {}
 
 Summary (first 500 chars):
-{story.get('narrative', '')[:500]}...
+{}...
 """
 
 
-def _format_preferences(prefs: Dict[str, Any]) -> str:
-    """Format user preferences for prompt context."""
-    if not prefs:
-        return "No preferences set"
+def _story_fields(story: Dict[str, Any]) -> Tuple[str, ...]:
+    """Extract the story fields shown in the prompt, in template order."""
+    get = story.get
+    narrative = str(get('narrative') or '')
+    if len(narrative) > 500:
+        narrative = narrative[:500]
+
+    return (
+        str(get('title', 'Unknown')),
+        str(get('genre', 'Unknown')),
+        str(get('word_count', 'Unknown')),
+        str(get('created_at', 'Unknown')),
+        str(get('rating', 'Not rated')),
+        narrative,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _format_story_context(story_fields: Tuple[str, ...]) -> str:
+    """Format extracted story fields for prompt context.
+
+    Cached so repeated retell turns on the same story (which differ only in
+    feedback) reuse the rendered block.
+    """
+    return _STORY_CTX_TEMPLATE.format(*story_fields)
+
+
+# (preference key, prompt label) in the order they appear in the prompt
+_PREF_FIELDS = (
+    ("story_length", "- Preferred length: "),
+    ("delivery_time", "- Delivery time: "),
+    ("voice_id", "- Narrator voice: "),
+)
+
 
-    lines = []
-    if prefs.get('story_length'):
-        lines.append(f"- Preferred length: {prefs['story_length']}")
-    if prefs.get('delivery_time'):
-        lines.append(f"- Delivery time: {prefs['delivery_time']}")
-    if prefs.get('voice_id'):
-        lines.append(f"- Narrator voice: {prefs['voice_id']}")
+def _pref_values(prefs: Dict[str, Any]) -> Tuple[Optional[str], ...]:
+    """Extract the preference values shown in the prompt (None when unset)."""
+    return tuple(str(prefs[key]) if prefs.get(key) else None for key, _ in _PREF_FIELDS)
 
-    return "\n".join(lines) if lines else "Default preferences"
+
+def _format_preferences(pref_values: Tuple[Optional[str], ...]) -> str:
+    """Format extracted preference values for prompt context."""
+    text = "\n".join(
+        label + value for (_, label), value in zip(_PREF_FIELDS, pref_values) if value is not None
+    )
+    return text or "Default preferences"
 
 
 def get_writers_room_response(scenario: str) -> str:
     """Get a random writers room response for a scenario."""
-    import random
-    responses = WRITERS_ROOM_SCENARIOS.get(scenario, [])
+    responses = _SCENARIOS.get(scenario)
     if responses:
         return random.choice(responses)
     return "I'll talk to the writers about this."
+
+
+# =============================================================================
+# String Interning
+# =============================================================================
+
+# The prompt fragments live for the life of the process. Interning makes any
+# equal string built elsewhere resolve to the same object, so equality checks
+# against them can short-circuit on identity. It does not change how memory
+# is shared between worker processes.
+FIXION_BASE_CHARACTER = sys.intern(FIXION_BASE_CHARACTER)
+ONBOARDING_CONTEXT = sys.intern(ONBOARDING_CONTEXT)
+GENERAL_CONTEXT = sys.intern(GENERAL_CONTEXT)
+
+# Read-only view of the writers room lines used by get_writers_room_response
+_SCENARIOS = types.MappingProxyType({
+    scenario: tuple(sys.intern(r) for r in responses)
+    for scenario, responses in WRITERS_ROOM_SCENARIOS.items()
+})
+
+
+# =============================================================================
+# Precomputed Prompts
+# =============================================================================
+
+# (context, lowercase genre or None) -> prompt for the calls that carry no
+# story, feedback or preferences, so they skip the builder entirely.
+_STATIC_PROMPTS: Dict[Tuple[str, Optional[str]], str] = {
+    (context, alias): _build_prompt_cached.__wrapped__(context, key, None, None, None)
+    for context in ("general", "onboarding")
+    for alias, key in [(None, None), *_GENRE_KEYS.items()]
+}
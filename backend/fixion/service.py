@@ -5,18 +5,248 @@ Handles the core chat functionality for Fixion, including
 message processing, context management, and LLM integration.
 """
 
-from typing import Optional, Dict, Any, List, AsyncGenerator
+import asyncio
+import io
+import re
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, AsyncGenerator, Tuple
 from datetime import datetime, timezone
 from uuid import UUID
 
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 from backend.config import config
 from backend.database.conversations import ConversationService
 from backend.database.users import UserService
 from backend.database.stories import StoryService
-from .prompts import get_fixion_system_prompt, get_writers_room_response, FIXION_PERSONAS
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+
+from .prompts import (
+    get_fixion_system_prompt,
+    get_writers_room_response,
+    resolve_genre,
+    FIXION_PERSONAS,
+)
+
+
+# Number of prior messages sent to the LLM with each turn
+HISTORY_LIMIT = 20
+
+# Rough input budget for prior messages, estimated at ~4 characters/token
+HISTORY_TOKEN_BUDGET = 6000
+_CHARS_PER_TOKEN = 4
+
+
+def _recent_history(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Select the most recent messages that fit the history limits.
+
+    Walks newest to oldest, stopping at HISTORY_LIMIT messages or once the
+    estimated token budget would be exceeded (the newest message is always
+    kept).
+    """
+    budget = HISTORY_TOKEN_BUDGET * _CHARS_PER_TOKEN
+    start = len(messages)
+    floor = max(0, start - HISTORY_LIMIT)
+    while start > floor:
+        size = len(messages[start - 1].get("content") or "")
+        if size > budget and start < len(messages):
+            break
+        budget -= size
+        start -= 1
+    return messages[start:]
+
+# Replies to conversation-opening messages, keyed by (system prompt,
+# normalized message). Only turns with no prior history are cached, since
+# anything later depends on the conversation so far.
+_RESPONSE_CACHE_SIZE = 2048
+_response_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
+
+# Model calls currently running for a cache key, shared by identical requests
+_inflight: Dict[tuple, "asyncio.Future[str]"] = {}
+
+
+def _response_cache_key(system_prompt: str, user_message: str) -> tuple:
+    return (system_prompt, " ".join(user_message.lower().split()))
+
+
+def _cached_response(key: tuple) -> Optional[str]:
+    reply = _response_cache.get(key)
+    if reply is not None:
+        _response_cache.move_to_end(key)
+    return reply
+
+
+def _cache_response(key: tuple, reply: str) -> None:
+    _response_cache[key] = reply
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+# Short-lived copies of the story rows that chat turns read for prompt
+# context. The user row is not cached: genre and preferences are written
+# from several routes (and processes) and a chat turn must see them at once.
+_LOOKUP_TTL_SECONDS = 30.0
+_lookup_cache: Dict[tuple, tuple] = {}
+
+
+async def _cached_lookup(key: tuple, fetch) -> Optional[Dict[str, Any]]:
+    """Return a cached row for key, calling fetch() when missing or expired."""
+    now = time.monotonic()
+    hit = _lookup_cache.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    row = await fetch()
+    if row is not None:
+        _lookup_cache[key] = (now + _LOOKUP_TTL_SECONDS, row)
+        if len(_lookup_cache) > 10_000:
+            # Drop expired entries; clear outright if everything is live
+            for k in [k for k, v in _lookup_cache.items() if v[0] <= now]:
+                del _lookup_cache[k]
+            if len(_lookup_cache) > 10_000:
+                _lookup_cache.clear()
+    return row
+
+
+def _cached_block(text: str) -> List[Dict[str, Any]]:
+    """Wrap text in a content block marked as an Anthropic prompt-cache breakpoint."""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+def _llm_messages(
+    system_prompt: str, history: List[Dict[str, Any]], user_message: str
+) -> list:
+    """
+    Build the LangChain message list for a turn.
+
+    The system prompt and the end of the prior history are marked for
+    prompt caching, so follow-up turns only pay full price for the new
+    message.
+    """
+    messages = [SystemMessage(content=_cached_block(system_prompt))]
+    last = len(history) - 1
+    for i, msg in enumerate(history):
+        content = _cached_block(msg["content"]) if i == last else msg["content"]
+        if msg["role"] == "user":
+            messages.append(HumanMessage(content=content))
+        else:
+            messages.append(AIMessage(content=content))
+    messages.append(HumanMessage(content=user_message))
+    return messages
+
+
+# Caps in-flight Anthropic chat calls so a burst queues here instead of
+# piling up connections and timeouts against the API
+_llm_slots = asyncio.Semaphore(config.ANTHROPIC_MAX_CONCURRENCY)
+
+# Revision-type indicators, matched anywhere in the feedback (substring
+# semantics, so "renamed" or "plotline" still count)
+_SURFACE_KEYWORDS = re.compile(
+    "|".join(["name", "rename", "change the name", "call them", "typo"]),
+    re.IGNORECASE,
+)
+_STRUCTURE_KEYWORDS = re.compile(
+    "|".join([
+        "plot", "ending", "twist", "arc", "pacing", "restructure",
+        "rewrite", "different direction", "whole thing",
+    ]),
+    re.IGNORECASE,
+)
+
+# Shared chat model, created on first use
+_fixion_llm: Optional["ChatAnthropic"] = None
+
+
+def get_fixion_llm() -> "ChatAnthropic":
+    """
+    Get the shared ChatAnthropic client used for Fixion chat.
+
+    FixionService is constructed per request; sharing one client keeps a
+    single Anthropic HTTP connection pool alive instead of opening a new
+    one each time.
+    """
+    global _fixion_llm
+
+    if _fixion_llm is None:
+        # Imported here: the Anthropic SDK and its HTTP stack are only
+        # needed once the first chat actually runs
+        from langchain_anthropic import ChatAnthropic
+
+        _fixion_llm = ChatAnthropic(
+            model=FixionService.DEFAULT_MODEL,
+            temperature=0.8,  # Slightly higher for more personality
+            max_tokens=1024,  # Chat responses should be concise
+            anthropic_api_key=config.ANTHROPIC_API_KEY,
+        )
+    return _fixion_llm
+
+
+# =========================================================================
+# Canned Messages
+# =========================================================================
+
+_ONBOARDING_OPENING = """Hey! Welcome to FixionMail. I'm Fixion — receptionist, intake specialist, and... *glances around* ...actor.
+
+Between auditions, anyway.
+
+So! I'll be getting you set up with your daily stories. First things first — what genre speaks to your soul?
+
+**Choose your genre:**"""
+
+_INTENSITY_QUESTION = """
+
+How intense should we go?
+
+**Choose intensity:**
+- **Light & Cozy** — Easy reading, feel-good vibes
+- **Moderate** — Some tension, stakes that matter
+- **Dark & Gritty** — Mature themes, real consequences"""
+
+# Reply to each genre pick: the persona's pivot line, then on to intensity
+_GENRE_SELECTED_RESPONSES = {
+    key: persona.pivot_line + _INTENSITY_QUESTION
+    for key, persona in FIXION_PERSONAS.items()
+}
+
+_CHECKIN_MESSAGES = {
+    "first_story": """Hey — Fixion here.
+
+Your first story went out this morning. I'm not nervous or anything. I just... want to know if it worked for you.
+
+Too dark? Not dark enough? Wrong vibe entirely?
+
+Hit reply or come chat with me. I can take it.
+
+— Fixion""",
+
+    "week_one": """You've been with me a week now. Five stories.
+
+Are we vibing? Anything you want me to adjust?
+
+Or if everything's perfect, just ignore this. I'll pretend I'm not refreshing my inbox.
+
+— Fixion""",
+
+    "inactive": """Hey, it's Fixion.
+
+I've been sending stories but haven't heard from you in a bit. No pressure — just checking you're still out there.
+
+If you want to shake things up, I'm here.
+
+— Fixion""",
+}
+
+_GREAT_FEEDBACK_CHECKIN = """Just wanted to say — I passed along your feedback about "{title}".
+
+The writers were genuinely touched. Elena did a little happy dance. (She thinks no one saw. I saw.)
+
+Thanks for taking the time. It means something.
+
+— Fixion"""
 
 
 class FixionService:
@@ -35,6 +265,7 @@ class FixionService:
         conversation_service: Optional[ConversationService] = None,
         user_service: Optional[UserService] = None,
         story_service: Optional[StoryService] = None,
+        llm: Optional["ChatAnthropic"] = None,
     ):
         """
         Initialize Fixion service.
@@ -44,19 +275,15 @@ class FixionService:
             conversation_service: Conversation database service
             user_service: User database service
             story_service: Story database service
+            llm: Chat model; defaults to the shared Fixion client
         """
         self.user_id = user_id
         self.conversation_service = conversation_service or ConversationService()
         self.user_service = user_service or UserService()
         self.story_service = story_service or StoryService()
 
-        # Initialize LLM
-        self.llm = ChatAnthropic(
-            model=self.DEFAULT_MODEL,
-            temperature=0.8,  # Slightly higher for more personality
-            max_tokens=1024,  # Chat responses should be concise
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
-        )
+        # Shared LLM client (reuses its HTTP connection pool across requests)
+        self.llm = llm or get_fixion_llm()
 
     # =========================================================================
     # Core Chat Methods
@@ -81,65 +308,17 @@ class FixionService:
         Returns:
             Response dict with message, conversation_id, and metadata
         """
-        # Get or create conversation
-        if conversation_id:
-            conversation = await self.conversation_service.get_by_id(conversation_id)
-            if not conversation:
-                conversation = await self.conversation_service.create(
-                    self.user_id, context_type, story_id
-                )
-        else:
-            conversation = await self.conversation_service.get_or_create_active(
-                self.user_id, context_type, story_id
-            )
-
-        conversation_id = conversation["id"]
-
-        # Get user data for context
-        user = await self.user_service.get_by_id(self.user_id) if self.user_id else None
-        genre = user.get("current_genre") if user else None
-        preferences = user.get("preferences", {}) if user else {}
-
-        # Get story context if discussing a story
-        story_context = None
-        if story_id:
-            story_context = await self.story_service.get_by_id(story_id)
-
-        # Build system prompt
-        system_prompt = get_fixion_system_prompt(
-            context=context_type,
-            genre=genre,
-            story_context=story_context,
-            user_preferences=preferences,
+        conversation_id, messages, genre, cache_key = await self._prepare_turn(
+            user_message, context_type, story_id, conversation_id
         )
 
-        # Get conversation history
-        history = await self.conversation_service.get_messages_for_llm(
-            conversation_id, limit=20
-        )
-
-        # Build messages for LLM
-        messages = [SystemMessage(content=system_prompt)]
-
-        for msg in history:
-            if msg["role"] == "user":
-                messages.append(HumanMessage(content=msg["content"]))
-            else:
-                messages.append(AIMessage(content=msg["content"]))
-
-        # Add current message
-        messages.append(HumanMessage(content=user_message))
-
         # Generate response
-        response = await self.llm.ainvoke(messages)
-        assistant_message = response.content
+        assistant_message = await self._generate(messages, cache_key)
 
-        # Save messages to conversation
-        await self.conversation_service.add_message(
-            conversation_id, "user", user_message
-        )
-        await self.conversation_service.add_message(
-            conversation_id, "assistant", assistant_message
+        # Save both sides of the exchange in one update
+        await self.conversation_service.add_messages(
+            conversation_id,
+            [("user", user_message), ("assistant", assistant_message)],
         )
 
         return {
@@ -149,18 +328,19 @@ class FixionService:
             "genre": genre,
         }
 
-    async def chat_stream(
+    async def _prepare_turn(
         self,
         user_message: str,
-        context_type: str = "general",
-        story_id: Optional[str] = None,
-        conversation_id: Optional[str] = None,
-    ) -> AsyncGenerator[str, None]:
+        context_type: str,
+        story_id: Optional[str],
+        conversation_id: Optional[str],
+    ) -> Tuple[str, list, Optional[str], Optional[tuple]]:
         """
-        Stream a chat response for real-time display.
+        Load everything a chat turn needs and build the LLM messages.
 
-        Yields:
-            Chunks of the response text
+        Returns:
+            (conversation_id, messages, genre, response cache key); the cache
+            key is None unless this is the conversation's opening message
         """
         # Get or create conversation
         if conversation_id:
@@ -176,16 +356,18 @@ class FixionService:
 
         conversation_id = conversation["id"]
 
-        # Get user data for context
+        # The conversation row already carries its messages; use the recent
+        # window from it instead of fetching the same row again
+        history = _recent_history(conversation.get("messages") or [])
+
         user = await self.user_service.get_by_id(self.user_id) if self.user_id else None
+        story_context = await _cached_lookup(
+            ("story", str(story_id)),
+            lambda: self.story_service.get_by_id(story_id),
+        ) if story_id else None
         genre = user.get("current_genre") if user else None
         preferences = user.get("preferences", {}) if user else {}
 
-        # Get story context if discussing a story
-        story_context = None
-        if story_id:
-            story_context = await self.story_service.get_by_id(story_id)
-
         # Build system prompt
         system_prompt = get_fixion_system_prompt(
             context=context_type,
@@ -194,36 +376,83 @@ class FixionService:
             user_preferences=preferences,
         )
 
-        # Get conversation history
-        history = await self.conversation_service.get_messages_for_llm(
-            conversation_id, limit=20
+        # Build messages for LLM
+        messages = _llm_messages(system_prompt, history, user_message)
+
+        # Opening messages with identical context can reuse an earlier reply
+        cache_key = (
+            _response_cache_key(system_prompt, user_message) if not history else None
         )
 
-        # Build messages for LLM
-        messages = [SystemMessage(content=system_prompt)]
+        return conversation_id, messages, genre, cache_key
 
-        for msg in history:
-            if msg["role"] == "user":
-                messages.append(HumanMessage(content=msg["content"]))
-            else:
-                messages.append(AIMessage(content=msg["content"]))
+    async def _invoke(self, messages: list) -> str:
+        """Run one model call within the shared concurrency limit."""
+        async with _llm_slots:
+            response = await self.llm.ainvoke(messages)
+        return response.content
 
-        messages.append(HumanMessage(content=user_message))
+    async def _generate(self, messages: list, cache_key: Optional[tuple]) -> str:
+        """
+        Get a reply for messages, reusing cached or in-flight replies for
+        cacheable opening turns.
 
-        # Save user message
-        await self.conversation_service.add_message(
-            conversation_id, "user", user_message
+        Concurrent identical openers share a single model call rather than
+        each sending their own.
+        """
+        if cache_key is None:
+            return await self._invoke(messages)
+
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        pending = _inflight.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._invoke(messages))
+            _inflight[cache_key] = pending
+            pending.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+
+        # Shield so one caller disconnecting doesn't cancel the others' reply
+        reply = await asyncio.shield(pending)
+        _cache_response(cache_key, reply)
+        return reply
+
+    async def chat_stream(
+        self,
+        user_message: str,
+        context_type: str = "general",
+        story_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream a chat response for real-time display.
+
+        Yields:
+            Chunks of the response text
+        """
+        conversation_id, messages, _, _ = await self._prepare_turn(
+            user_message, context_type, story_id, conversation_id
+        )
+
+        # Save user message while the first chunk is on its way
+        user_write = asyncio.create_task(
+            self.conversation_service.add_message(conversation_id, "user", user_message)
         )
 
         # Stream response
-        full_response = []
-        async for chunk in self.llm.astream(messages):
-            if chunk.content:
-                full_response.append(chunk.content)
-                yield chunk.content
+        full_response = io.StringIO()
+        try:
+            async with _llm_slots:
+                async for chunk in self.llm.astream(messages):
+                    if chunk.content:
+                        full_response.write(chunk.content)
+                        yield chunk.content
+        finally:
+            await user_write
 
         # Save complete response
-        assistant_message = "".join(full_response)
+        assistant_message = full_response.getvalue()
         await self.conversation_service.add_message(
             conversation_id, "assistant", assistant_message
         )
@@ -242,14 +471,7 @@ class FixionService:
             self.user_id
         )
 
-        # Get the opening message
-        opening = """Hey! Welcome to FixionMail. I'm Fixion — receptionist, intake specialist, and... *glances around* ...actor.
-
-Between auditions, anyway.
-
-So! I'll be getting you set up with your daily stories. First things first — what genre speaks to your soul?
-
-**Choose your genre:**"""
+        opening = _ONBOARDING_OPENING
 
         # Save the opening message
         await self.conversation_service.add_message(
@@ -276,42 +498,27 @@ So! I'll be getting you set up with your daily stories. First things first — w
         Returns:
             Fixion's genre-specific response
         """
-        genre_lower = genre.lower()
+        genre_lower = resolve_genre(genre)
 
-        if genre_lower not in FIXION_PERSONAS:
+        if genre_lower is None:
             return await self.chat(
                 f"I picked {genre}",
                 context_type="onboarding",
                 conversation_id=conversation_id
             )
 
-        persona = FIXION_PERSONAS[genre_lower]
-
         # Update user's current genre
         if self.user_id:
             await self.user_service.set_current_genre(self.user_id, genre_lower)
             await self.user_service.update_onboarding_step(self.user_id, "intensity")
 
-        # Get the pivot line and continue
-        pivot = persona["pivot_line"]
-
-        intensity_question = """
-
-How intense should we go?
-
-**Choose intensity:**
-- **Light & Cozy** — Easy reading, feel-good vibes
-- **Moderate** — Some tension, stakes that matter
-- **Dark & Gritty** — Mature themes, real consequences"""
-
-        response = pivot + intensity_question
+        # Pivot line followed by the intensity question
+        response = _GENRE_SELECTED_RESPONSES[genre_lower]
 
         # Save to conversation
-        await self.conversation_service.add_message(
-            conversation_id, "user", f"I want {genre}"
-        )
-        await self.conversation_service.add_message(
-            conversation_id, "assistant", response
+        await self.conversation_service.add_messages(
+            conversation_id,
+            [("user", f"I want {genre}"), ("assistant", response)],
         )
 
         return {
@@ -463,19 +670,10 @@ Want me to send it through?"""
 
         This is a simple heuristic - the LLM can also help classify.
         """
-        feedback_lower = feedback.lower()
-
-        # Surface indicators
-        surface_keywords = ["name", "rename", "change the name", "call them", "typo"]
-        if any(kw in feedback_lower for kw in surface_keywords):
+        if _SURFACE_KEYWORDS.search(feedback):
             return "surface"
 
-        # Structure indicators
-        structure_keywords = [
-            "plot", "ending", "twist", "arc", "pacing", "restructure",
-            "rewrite", "different direction", "whole thing"
-        ]
-        if any(kw in feedback_lower for kw in structure_keywords):
+        if _STRUCTURE_KEYWORDS.search(feedback):
             return "structure"
 
         # Default to prose
@@ -534,40 +732,6 @@ Gerald and I are going to have a conversation."""
         Returns:
             Check-in message text
         """
-        messages = {
-            "first_story": f"""Hey — Fixion here.
-
-Your first story went out this morning. I'm not nervous or anything. I just... want to know if it worked for you.
-
-Too dark? Not dark enough? Wrong vibe entirely?
-
-Hit reply or come chat with me. I can take it.
-
-— Fixion""",
-
-            "week_one": """You've been with me a week now. Five stories.
-
-Are we vibing? Anything you want me to adjust?
-
-Or if everything's perfect, just ignore this. I'll pretend I'm not refreshing my inbox.
-
-— Fixion""",
-
-            "inactive": """Hey, it's Fixion.
-
-I've been sending stories but haven't heard from you in a bit. No pressure — just checking you're still out there.
-
-If you want to shake things up, I'm here.
-
-— Fixion""",
-
-            "great_feedback": f"""Just wanted to say — I passed along your feedback about "{story_title or 'that story'}".
-
-The writers were genuinely touched. Elena did a little happy dance. (She thinks no one saw. I saw.)
-
-Thanks for taking the time. It means something.
-
-— Fixion""",
-        }
-
-        return messages.get(trigger, "Hey, just checking in. — Fixion")
+        if trigger == "great_feedback":
+            return _GREAT_FEEDBACK_CHECKIN.format(title=story_title or "that story")
+        return _CHECKIN_MESSAGES.get(trigger, "Hey, just checking in. — Fixion")
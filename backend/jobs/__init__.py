@@ -22,20 +22,46 @@ Usage:
     status = await queue.get_status(job_id)
 """
 
-from backend.database.jobs import JobQueueService, JobStatus
-from backend.jobs.queue import StoryJobQueue, get_queue, close_queue
-from backend.jobs.worker import (
-    StoryWorker,
-    start_story_worker,
-    stop_story_worker,
-    get_worker
-)
-from backend.jobs.daily_scheduler import (
-    DailyStoryScheduler,
-    start_daily_scheduler,
-    stop_daily_scheduler,
-    get_daily_scheduler
-)
+import importlib
+
+# Exports are resolved on first access so importing one submodule (or just
+# JobStatus) doesn't pull in the worker, scheduler and their dependencies
+_EXPORTS = {
+    # Database/Service
+    "JobQueueService": "backend.database.jobs",
+    "JobStatus": "backend.database.jobs",
+
+    # Queue
+    "StoryJobQueue": "backend.jobs.queue",
+    "get_queue": "backend.jobs.queue",
+    "close_queue": "backend.jobs.queue",
+
+    # Worker
+    "StoryWorker": "backend.jobs.worker",
+    "start_story_worker": "backend.jobs.worker",
+    "stop_story_worker": "backend.jobs.worker",
+    "get_worker": "backend.jobs.worker",
+
+    # Daily Scheduler
+    "DailyStoryScheduler": "backend.jobs.daily_scheduler",
+    "start_daily_scheduler": "backend.jobs.daily_scheduler",
+    "stop_daily_scheduler": "backend.jobs.daily_scheduler",
+    "get_daily_scheduler": "backend.jobs.daily_scheduler",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
 
 __all__ = [
     # Database/Service
@@ -23,7 +23,6 @@ import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any, Optional
 from uuid import uuid4
-from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -31,12 +30,30 @@ from apscheduler.triggers.interval import IntervalTrigger
 from backend.database.users import UserService
 from backend.database.stories import StoryService
 from backend.database.jobs import JobQueueService
+from backend.jobs.worker import wake_story_worker
 from backend.storyteller.bible_enhancement import get_genre_config
 from backend.utils.logging import get_logger
+from backend.utils.timezones import get_tz, parse_delivery_time
 
 logger = get_logger("daily_scheduler")
 
 
+# Job settings shared by every daily story of a tier; per-user fields are
+# added in _build_daily_job
+_FREE_SETTINGS = {
+    "user_tier": "free",
+    "writer_model": "sonnet",
+    "structure_model": "sonnet",
+    "editor_model": "sonnet",
+    "dev_mode": False,  # Production mode
+    # IMPORTANT: Marks this as a scheduled daily story (vs manual generation)
+    # Only daily stories update last_story_at to prevent duplicate daily deliveries
+    # Manual stories are "extras" and don't block the next scheduled story
+    "is_daily": True,
+}
+_PREMIUM_SETTINGS = {**_FREE_SETTINGS, "user_tier": "premium", "editor_model": "opus"}
+
+
 class DailyStoryScheduler:
     """
     Scheduler that checks for users who need their daily story.
@@ -79,14 +96,6 @@ class DailyStoryScheduler:
             delivery_window=self.delivery_window
         )
 
-    def _parse_delivery_time(self, time_str: str) -> tuple[int, int]:
-        """Parse HH:MM string to (hour, minute) tuple."""
-        try:
-            parts = time_str.split(":")
-            return int(parts[0]), int(parts[1])
-        except (ValueError, IndexError):
-            return 8, 0  # Default to 8:00 AM
-
     def _is_generation_time(
         self,
         delivery_time: str,
@@ -111,41 +120,44 @@ class DailyStoryScheduler:
         if now is None:
             now = datetime.now(timezone.utc)
 
-        try:
-            tz = ZoneInfo(user_timezone)
-        except Exception:
-            tz = ZoneInfo("UTC")
-
-        # Convert current time to user's timezone
-        user_now = now.astimezone(tz)
+        tz = get_tz(user_timezone)
+        user_today = now.astimezone(tz)
 
         # Parse delivery time
-        target_hour, target_minute = self._parse_delivery_time(delivery_time)
-
-        # Create target DELIVERY datetime in user's timezone for today
-        delivery_datetime = user_now.replace(
-            hour=target_hour,
-            minute=target_minute,
-            second=0,
-            microsecond=0
-        )
+        target_hour, target_minute = parse_delivery_time(delivery_time)
 
-        # Calculate when to START generation (before delivery time)
-        generation_start = delivery_datetime - timedelta(minutes=self.generation_lead)
-        generation_end = generation_start + timedelta(minutes=self.delivery_window)
+        # Target DELIVERY instant in user's timezone for today, as a UTC
+        # timestamp so the window check is plain float arithmetic
+        delivery_ts = datetime(
+            user_today.year, user_today.month, user_today.day,
+            target_hour, target_minute, tzinfo=tz
+        ).timestamp()
 
-        return generation_start <= user_now < generation_end
+        # Generation STARTS before delivery time and stays open for the window
+        generation_start = delivery_ts - self.generation_lead * 60
+        return generation_start <= now.timestamp() < generation_start + self.delivery_window * 60
 
-    def _has_story_today(self, user: Dict[str, Any]) -> bool:
+    def _has_story_today(
+        self, user: Dict[str, Any], now: Optional[datetime] = None
+    ) -> bool:
         """Check if user already received a story today (in their timezone)."""
         last_story_at = user.get("last_story_at")
         if not last_story_at:
             return False
 
+        if now is None:
+            now = datetime.now(timezone.utc)
+
         # Parse last_story_at
         if isinstance(last_story_at, str):
+            # Fast path: an ISO date prefix more than 3 days back can't be
+            # "today" in any timezone (offsets shift the date by at most one
+            # day either side), so skip the full parse
+            if last_story_at[:10] < (now - timedelta(days=3)).date().isoformat():
+                return False
             try:
-                last_story_dt = datetime.fromisoformat(last_story_at.replace("Z", "+00:00"))
+                # fromisoformat accepts a trailing "Z" on Python 3.11+
+                last_story_dt = datetime.fromisoformat(last_story_at)
             except ValueError:
                 return False
         else:
@@ -153,13 +165,10 @@ class DailyStoryScheduler:
 
         # Get user's timezone
         user_timezone = user.get("preferences", {}).get("timezone", "UTC")
-        try:
-            tz = ZoneInfo(user_timezone)
-        except Exception:
-            tz = ZoneInfo("UTC")
+        tz = get_tz(user_timezone)
 
         # Check if last story was today in user's timezone
-        now_user_tz = datetime.now(timezone.utc).astimezone(tz)
+        now_user_tz = now.astimezone(tz)
         last_story_user_tz = last_story_dt.astimezone(tz)
 
         return now_user_tz.date() == last_story_user_tz.date()
@@ -176,83 +185,105 @@ class DailyStoryScheduler:
         queued_count = 0
 
         try:
+            # One clock reading for the whole tick
+            now = datetime.now(timezone.utc)
+            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
             # Get all users who might need stories
             users = await self.user_service.get_users_needing_story(
-                before_time=datetime.now(timezone.utc)
+                before_time=now
             )
 
+            # Cheap in-memory checks first
+            candidates = []
             for user in users:
                 try:
-                    user_id = user.get("id")
-
                     # Skip if no credits
                     credits = user.get("credits", 0)
                     if credits < 1:
                         continue
 
-                    # Skip if already received story today
-                    if self._has_story_today(user):
-                        continue
-
-                    # Skip if user already has a pending/running job
-                    active_jobs = await self.job_service.get_user_active_jobs(user_id, limit=1)
-                    if active_jobs:
-                        logger.debug(
-                            "Skipping user - already has active job",
-                            email=user.get('email'),
-                            job_id=active_jobs[0].get('job_id')
-                        )
-                        continue
-
-                    # Double-check for completed jobs today (fresh query to catch race conditions)
-                    # This catches cases where last_story_at hasn't been updated yet but a job completed
-                    from datetime import timezone as tz
-                    today_start = datetime.now(tz.utc).replace(
-                        hour=0, minute=0, second=0, microsecond=0
-                    )
-                    recent_jobs = await self.job_service.get_recent_jobs(email=user.get('email'), limit=1)
-                    if recent_jobs:
-                        latest_job = recent_jobs[0]
-                        if latest_job.get('status') == 'completed':
-                            created_at = latest_job.get('created_at')
-                            if created_at:
-                                # Parse and check if created today
-                                if isinstance(created_at, str):
-                                    job_created = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                                else:
-                                    job_created = created_at
-                                if job_created.astimezone(tz.utc) >= today_start:
-                                    logger.debug(
-                                        "Skipping user - already has completed job today",
-                                        email=user.get('email'),
-                                        job_id=latest_job.get('job_id')
-                                    )
-                                    continue
-
                     # Get delivery preferences
                     prefs = user.get("preferences", {})
                     delivery_time = prefs.get("delivery_time", "08:00")
                     user_timezone = prefs.get("timezone", "UTC")
 
-                    # Check if it's time to START generating (ahead of delivery time)
-                    if not self._is_generation_time(delivery_time, user_timezone):
+                    # Check if it's time to START generating (ahead of delivery time).
+                    # Most users are hours away, so this goes before any query.
+                    if not self._is_generation_time(delivery_time, user_timezone, now):
                         continue
 
-                    # Queue story generation
-                    await self._queue_story_for_user(user)
-                    queued_count += 1
+                    # Skip if already received story today
+                    if self._has_story_today(user, now):
+                        continue
 
+                    candidates.append(user)
                 except Exception as e:
                     logger.error(f"Error checking user", email=user.get('email'), error=str(e))
+
+            # Users that already have a pending/running job, or a job completed
+            # today (last_story_at may not be updated yet), one query each
+            candidate_ids = [user["id"] for user in candidates]
+            if candidate_ids:
+                active_user_ids = await self.job_service.get_users_with_active_jobs(candidate_ids)
+                completed_user_ids = await self.job_service.get_users_with_completed_jobs_since(
+                    candidate_ids, today_start
+                )
+            else:
+                active_user_ids = completed_user_ids = set()
+
+            pending_jobs: List[Dict[str, Any]] = []
+            for user in candidates:
+                if user["id"] in active_user_ids:
+                    logger.debug(
+                        "Skipping user - already has active job",
+                        email=user.get('email')
+                    )
+                    continue
+                if user["id"] in completed_user_ids:
+                    logger.debug(
+                        "Skipping user - already has completed job today",
+                        email=user.get('email')
+                    )
                     continue
 
+                try:
+                    pending_jobs.append(self._build_daily_job(user, now=now))
+                except Exception as e:
+                    logger.error(f"Error checking user", email=user.get('email'), error=str(e))
+
+            if pending_jobs:
+                try:
+                    # One insert for the whole tick in the common case
+                    await self.job_service.create_jobs_batch(pending_jobs)
+                    queued = pending_jobs
+                except Exception as e:
+                    # A single bad row rejects the whole batch: fall back to
+                    # per-user inserts so one user can't block everyone else
+                    logger.warning(f"Batch job insert failed, inserting individually", error=str(e))
+                    queued = []
+                    for job in pending_jobs:
+                        try:
+                            await self.job_service.create_job(**job)
+                            queued.append(job)
+                        except Exception as job_error:
+                            logger.error(
+                                f"Error queueing daily story",
+                                email=job["user_email"],
+                                error=str(job_error)
+                            )
+
+                if queued:
+                    wake_story_worker()
+                queued_count = len(queued)
+                for job in queued:
+                    logger.info(f"Queued daily story", email=job["user_email"], job_id=job["job_id"])
+
             if queued_count > 0:
                 logger.info(f"Daily scheduler: Queued story jobs", count=queued_count)
 
         except Exception as e:
-            logger.error(f"Daily scheduler error", error=str(e))
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Daily scheduler error", error=str(e))
         finally:
             self._is_checking = False
 
@@ -266,6 +297,33 @@ class DailyStoryScheduler:
                                instead of waiting for user's scheduled delivery time.
                                Used for manual admin triggers to help users who missed their story.
         """
+        job = self._build_daily_job(user, immediate_delivery=immediate_delivery)
+
+        await self.job_service.create_job(**job)
+        wake_story_worker()
+
+        # NOTE: last_story_at is now updated in worker.py AFTER successful story generation
+        # This prevents blocking future stories if the job fails
+
+        logger.info(f"Queued daily story", email=job["user_email"], job_id=job["job_id"])
+
+    def _build_daily_job(
+        self,
+        user: Dict[str, Any],
+        immediate_delivery: bool = False,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the create_job arguments for a user's daily story.
+
+        Args:
+            user: User data dictionary
+            immediate_delivery: See _queue_story_for_user
+            now: Current UTC time, used for the job ID
+
+        Returns:
+            Dict with job_id, story_bible, user_email, settings and user_id
+        """
         user_id = user["id"]
         user_email = user["email"]
 
@@ -298,45 +356,31 @@ class DailyStoryScheduler:
         user_delivery_time = prefs.get("delivery_time", "08:00")
         user_timezone = prefs.get("timezone", "UTC")
 
-        # Determine user tier and model settings
+        # Start from the tier's model settings, then add the per-user fields
         is_premium = subscription_status == "active"
-        user_tier = "premium" if is_premium else "free"
-
-        settings = {
-            "user_tier": user_tier,
-            "user_id": user_id,
-            "story_length": prefs.get("story_length", "medium"),
-            "writer_model": "sonnet",
-            "structure_model": "sonnet",
-            "editor_model": "opus" if is_premium else "sonnet",
-            "tts_voice": prefs.get("voice_id", "nova"),
-            "dev_mode": False,  # Production mode
+        settings = dict(_PREMIUM_SETTINGS if is_premium else _FREE_SETTINGS)
+        settings.update(
+            user_id=user_id,
+            story_length=prefs.get("story_length", "medium"),
+            tts_voice=prefs.get("voice_id", "nova"),
             # Delivery preferences for scheduling email
-            "delivery_time": user_delivery_time,
-            "timezone": user_timezone,
+            delivery_time=user_delivery_time,
+            timezone=user_timezone,
             # If True, email is sent immediately after generation (for manual admin triggers)
-            "immediate_delivery": immediate_delivery,
-            # IMPORTANT: Marks this as a scheduled daily story (vs manual generation)
-            # Only daily stories update last_story_at to prevent duplicate daily deliveries
-            # Manual stories are "extras" and don't block the next scheduled story
-            "is_daily": True,
-        }
-
-        # Create job
-        job_id = f"daily_{user_id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
-
-        await self.job_service.create_job(
-            job_id=job_id,
-            story_bible=story_bible,
-            user_email=user_email,
-            settings=settings,
-            user_id=user_id
+            immediate_delivery=immediate_delivery,
         )
 
-        # NOTE: last_story_at is now updated in worker.py AFTER successful story generation
-        # This prevents blocking future stories if the job fails
+        if now is None:
+            now = datetime.now(timezone.utc)
+        job_id = f"daily_{user_id}_{now.strftime('%Y%m%d_%H%M%S')}"
 
-        logger.info(f"Queued daily story", email=user_email, job_id=job_id)
+        return {
+            "job_id": job_id,
+            "story_bible": story_bible,
+            "user_email": user_email,
+            "settings": settings,
+            "user_id": user_id,
+        }
 
     async def queue_story_now(
         self,
@@ -373,6 +417,7 @@ class DailyStoryScheduler:
             settings=default_settings,
             user_id=user_id
         )
+        wake_story_worker()
 
         logger.info(f"Queued manual story", email=user_email, job_id=job_id)
         return job_id
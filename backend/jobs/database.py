@@ -4,10 +4,13 @@ Uses aiosqlite for async SQLite operations.
 """
 
 import aiosqlite
+import asyncio
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import AsyncIterator, Optional, Dict, Any, List
 from enum import Enum
 
 
@@ -19,12 +22,80 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+def _utcnow() -> datetime:
+    """
+    Current UTC time as a naive datetime.
+
+    Timestamp columns hold naive UTC ISO strings. This keeps that format
+    without the deprecated datetime.utcnow().
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Hot-path statements, kept as module constants so every call passes the
+# identical SQL string and hits sqlite3's prepared-statement cache
+_GET_JOB_BY_ID_SQL = """
+    SELECT id, job_id, status, story_bible, user_email, settings,
+           current_step, progress_percent, result, error_message,
+           created_at, started_at, completed_at, generation_time_seconds
+    FROM story_jobs
+    WHERE job_id = ?
+"""
+
+_GET_JOB_STATUS_SQL = """
+    SELECT job_id, status, current_step, progress_percent, error_message,
+           created_at, started_at, completed_at, generation_time_seconds
+    FROM story_jobs
+    WHERE job_id = ?
+"""
+
+# NULL parameters leave the column unchanged, so one statement covers every
+# combination of update_status arguments
+_UPDATE_STATUS_SQL = """
+    UPDATE story_jobs
+    SET status = ?,
+        current_step = COALESCE(?, current_step),
+        progress_percent = COALESCE(?, progress_percent),
+        started_at = COALESCE(?, started_at)
+    WHERE job_id = ?
+"""
+
+_MARK_COMPLETED_SQL = """
+    UPDATE story_jobs
+    SET status = 'completed',
+        result = ?,
+        completed_at = ?,
+        generation_time_seconds = ?,
+        progress_percent = 100,
+        current_step = 'done'
+    WHERE job_id = ?
+"""
+
+
 class StoryJobDatabase:
     """Handles story job queue database operations"""
 
-    def __init__(self, db_path: str = "story_jobs.db"):
+    def __init__(self, db_path: str = "story_jobs.db", reader_count: int = 4):
         self.db_path = db_path
+        self.reader_count = reader_count
+        # Single writer connection; status/library reads use a separate pool
+        # so WAL lets them run alongside queue writes
         self._conn: Optional[aiosqlite.Connection] = None
+        self._readers: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self._reader_conns: List[aiosqlite.Connection] = []
+        self._now_cache: tuple[int, str] = (-1_000_000_000, "")
+
+    def _now_iso(self) -> str:
+        """
+        Current UTC time as an ISO string for timestamp columns.
+
+        Reused for up to a millisecond so a burst of writes doesn't build
+        and format a fresh datetime for each row.
+        """
+        now_ns = time.monotonic_ns()
+        if now_ns - self._now_cache[0] > 1_000_000:
+            self._now_cache = (now_ns, _utcnow().isoformat())
+        return self._now_cache[1]
 
     async def connect(self):
         """Connect to database and create tables if needed"""
@@ -35,10 +106,42 @@ class StoryJobDatabase:
 
         # Enable WAL mode and set timeout for better concurrent access
         self._conn = await aiosqlite.connect(self.db_path, timeout=30.0)
+        # Only takes effect on a new database file (before tables exist);
+        # lets cleanup_old_jobs hand freed pages back to the OS
+        await self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
         await self._conn.execute("PRAGMA journal_mode=WAL")
         await self._conn.execute("PRAGMA busy_timeout=30000")  # 30 second timeout
+        # WAL is crash-safe with NORMAL sync (no fsync per commit, only at checkpoints)
+        await self._conn.execute("PRAGMA synchronous=NORMAL")
+        await self._conn.execute("PRAGMA temp_store=MEMORY")
+        await self._conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        await self._conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        self._conn.row_factory = aiosqlite.Row  # Column access by name
         await self._create_tables()
 
+        # In-memory databases aren't shared between connections
+        reader_count = 0 if self.db_path == ":memory:" else self.reader_count
+        for _ in range(reader_count):
+            reader = await aiosqlite.connect(self.db_path, timeout=30.0)
+            await reader.execute("PRAGMA busy_timeout=30000")
+            await reader.execute("PRAGMA query_only=1")
+            await reader.execute("PRAGMA mmap_size=268435456")
+            reader.row_factory = aiosqlite.Row
+            self._reader_conns.append(reader)
+            self._readers.put_nowait(reader)
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection (the writer if no pool is configured)."""
+        if not self._reader_conns:
+            yield self._conn
+            return
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
     async def _create_tables(self):
         """Create required tables"""
         await self._conn.execute("""
@@ -81,6 +184,34 @@ class StoryJobDatabase:
             ON story_jobs(job_id)
         """)
 
+        # Worker FIFO poll only ever looks at pending rows; keep that index
+        # the size of the queue rather than the whole job history
+        await self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pending_fifo
+            ON story_jobs(created_at)
+            WHERE status = 'pending'
+        """)
+
+        # get_recent_jobs() without an email (walked backwards for DESC)
+        await self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_created_at
+            ON story_jobs(created_at)
+        """)
+
+        # get_recent_jobs(email=...)
+        await self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_recent
+            ON story_jobs(user_email, created_at DESC)
+        """)
+
+        # Library queries (get_completed_stories / get_story_count) filter by
+        # user and completion and page by completed_at
+        await self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_library
+            ON story_jobs(user_email, status, completed_at DESC)
+            WHERE result IS NOT NULL
+        """)
+
         await self._conn.commit()
 
     async def create_job(
@@ -104,7 +235,7 @@ class StoryJobDatabase:
             json.dumps(story_bible),
             user_email,
             json.dumps(settings) if settings else None,
-            datetime.utcnow().isoformat()
+            self._now_iso()
         ))
         await self._conn.commit()
         return cursor.lastrowid
@@ -122,47 +253,73 @@ class StoryJobDatabase:
         rows = await cursor.fetchall()
         return [
             {
-                "id": row[0],
-                "job_id": row[1],
-                "story_bible": json.loads(row[2]),
-                "user_email": row[3],
-                "settings": json.loads(row[4]) if row[4] else {},
-                "created_at": row[5],
-                "retry_count": row[6]
+                **row,
+                "story_bible": json.loads(row["story_bible"]),
+                "settings": json.loads(row["settings"]) if row["settings"] else {},
             }
-            for row in rows
+            for row in map(dict, rows)
         ]
 
-    async def get_job_by_id(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """Get a job by its job_id"""
+    async def claim_pending_jobs(self, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to `limit` pending jobs (FIFO) and mark them running.
+
+        One UPDATE ... RETURNING statement (SQLite 3.35+) replaces the
+        get_pending_jobs + update_status(RUNNING) pair, so two workers can
+        never pick up the same row.
+        """
         cursor = await self._conn.execute("""
-            SELECT id, job_id, status, story_bible, user_email, settings,
-                   current_step, progress_percent, result, error_message,
-                   created_at, started_at, completed_at, generation_time_seconds
-            FROM story_jobs
-            WHERE job_id = ?
-        """, (job_id,))
+            UPDATE story_jobs
+            SET status = 'running', started_at = ?
+            WHERE id IN (
+                SELECT id FROM story_jobs
+                WHERE status = 'pending'
+                ORDER BY created_at ASC
+                LIMIT ?
+            )
+            RETURNING id, job_id, story_bible, user_email, settings, created_at, retry_count
+        """, (self._now_iso(), limit))
+
+        rows = await cursor.fetchall()
+        await self._conn.commit()
+        return [
+            {
+                **row,
+                "story_bible": json.loads(row["story_bible"]),
+                "settings": json.loads(row["settings"]) if row["settings"] else {},
+            }
+            for row in map(dict, rows)
+        ]
 
+    async def count_pending(self) -> int:
+        """Count pending jobs (served from the idx_pending_fifo partial index)"""
+        cursor = await self._conn.execute(
+            "SELECT COUNT(*) FROM story_jobs WHERE status = 'pending'"
+        )
         row = await cursor.fetchone()
-        if not row:
-            return None
-
-        return {
-            "id": row[0],
-            "job_id": row[1],
-            "status": row[2],
-            "story_bible": json.loads(row[3]),
-            "user_email": row[4],
-            "settings": json.loads(row[5]) if row[5] else {},
-            "current_step": row[6],
-            "progress_percent": row[7],
-            "result": json.loads(row[8]) if row[8] else None,
-            "error_message": row[9],
-            "created_at": row[10],
-            "started_at": row[11],
-            "completed_at": row[12],
-            "generation_time_seconds": row[13]
-        }
+        return row[0]
+
+    async def get_job_by_id(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by its job_id"""
+        async with self._reader() as conn:
+            cursor = await conn.execute(_GET_JOB_BY_ID_SQL, (job_id,))
+
+            row = await cursor.fetchone()
+            if not row:
+                return None
+
+            job = dict(row)
+            job["story_bible"] = json.loads(job["story_bible"])
+            job["settings"] = json.loads(job["settings"]) if job["settings"] else {}
+            job["result"] = json.loads(job["result"]) if job["result"] else None
+            return job
+
+    async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's status/progress fields without decoding its payloads"""
+        async with self._reader() as conn:
+            cursor = await conn.execute(_GET_JOB_STATUS_SQL, (job_id,))
+            row = await cursor.fetchone()
+            return dict(row) if row else None
 
     async def update_status(
         self,
@@ -172,28 +329,11 @@ class StoryJobDatabase:
         progress_percent: Optional[int] = None
     ):
         """Update job status and progress"""
-        updates = ["status = ?"]
-        values = [status.value]
-
-        if current_step is not None:
-            updates.append("current_step = ?")
-            values.append(current_step)
-
-        if progress_percent is not None:
-            updates.append("progress_percent = ?")
-            values.append(progress_percent)
-
-        if status == JobStatus.RUNNING:
-            updates.append("started_at = ?")
-            values.append(datetime.utcnow().isoformat())
-
-        values.append(job_id)
-
-        await self._conn.execute(f"""
-            UPDATE story_jobs
-            SET {', '.join(updates)}
-            WHERE job_id = ?
-        """, values)
+        started_at = self._now_iso() if status == JobStatus.RUNNING else None
+        await self._conn.execute(
+            _UPDATE_STATUS_SQL,
+            (status.value, current_step, progress_percent, started_at, job_id)
+        )
         await self._conn.commit()
 
     async def mark_completed(
@@ -203,18 +343,9 @@ class StoryJobDatabase:
         generation_time: float
     ):
         """Mark a job as completed with its result"""
-        await self._conn.execute("""
-            UPDATE story_jobs
-            SET status = 'completed',
-                result = ?,
-                completed_at = ?,
-                generation_time_seconds = ?,
-                progress_percent = 100,
-                current_step = 'done'
-            WHERE job_id = ?
-        """, (
+        await self._conn.execute(_MARK_COMPLETED_SQL, (
             json.dumps(result),
-            datetime.utcnow().isoformat(),
+            self._now_iso(),
             generation_time,
             job_id
         ))
@@ -248,7 +379,7 @@ class StoryJobDatabase:
                 WHERE job_id = ?
             """, (
                 error_message,
-                datetime.utcnow().isoformat(),
+                self._now_iso(),
                 job_id
             ))
         await self._conn.commit()
@@ -259,37 +390,27 @@ class StoryJobDatabase:
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Get recent jobs, optionally filtered by email"""
-        if email:
-            cursor = await self._conn.execute("""
-                SELECT job_id, status, current_step, progress_percent,
-                       created_at, completed_at, generation_time_seconds
-                FROM story_jobs
-                WHERE user_email = ?
-                ORDER BY created_at DESC
-                LIMIT ?
-            """, (email, limit))
-        else:
-            cursor = await self._conn.execute("""
-                SELECT job_id, status, current_step, progress_percent,
-                       created_at, completed_at, generation_time_seconds
-                FROM story_jobs
-                ORDER BY created_at DESC
-                LIMIT ?
-            """, (limit,))
-
-        rows = await cursor.fetchall()
-        return [
-            {
-                "job_id": row[0],
-                "status": row[1],
-                "current_step": row[2],
-                "progress_percent": row[3],
-                "created_at": row[4],
-                "completed_at": row[5],
-                "generation_time_seconds": row[6]
-            }
-            for row in rows
-        ]
+        async with self._reader() as conn:
+            if email:
+                cursor = await conn.execute("""
+                    SELECT job_id, status, current_step, progress_percent,
+                           created_at, completed_at, generation_time_seconds
+                    FROM story_jobs
+                    WHERE user_email = ?
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                """, (email, limit))
+            else:
+                cursor = await conn.execute("""
+                    SELECT job_id, status, current_step, progress_percent,
+                           created_at, completed_at, generation_time_seconds
+                    FROM story_jobs
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                """, (limit,))
+
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
 
     async def get_completed_stories(
         self,
@@ -301,101 +422,129 @@ class StoryJobDatabase:
         Get completed stories with full content for the library.
         Returns stories with title, narrative, audio_url, image_url, etc.
         """
-        if email:
-            cursor = await self._conn.execute("""
-                SELECT job_id, user_email, result, story_bible,
-                       created_at, completed_at, generation_time_seconds
-                FROM story_jobs
-                WHERE status = 'completed'
-                AND result IS NOT NULL
-                AND user_email = ?
-                ORDER BY completed_at DESC
-                LIMIT ? OFFSET ?
-            """, (email, limit, offset))
-        else:
-            cursor = await self._conn.execute("""
-                SELECT job_id, user_email, result, story_bible,
-                       created_at, completed_at, generation_time_seconds
-                FROM story_jobs
-                WHERE status = 'completed'
-                AND result IS NOT NULL
-                ORDER BY completed_at DESC
-                LIMIT ? OFFSET ?
-            """, (limit, offset))
-
-        rows = await cursor.fetchall()
-        stories = []
-
-        for row in rows:
-            try:
-                result = json.loads(row[2]) if row[2] else {}
-            except (json.JSONDecodeError, TypeError):
-                # Skip malformed result data
-                continue
-
-            # Handle different result structures (old vs new format)
-            story_data = result.get("story", {})
-
-            # Fallback: if story_data is empty, try using result directly
-            # (in case old format stored story fields at root level)
-            if not story_data and "narrative" in result:
-                story_data = result
-
-            try:
-                bible = json.loads(row[3]) if row[3] else {}
-            except (json.JSONDecodeError, TypeError):
-                bible = {}
-
-            # Only include if we have actual content
-            narrative = story_data.get("narrative", "")
-            if not narrative:
-                continue
-
-            stories.append({
-                "job_id": row[0],
-                "user_email": row[1],
-                "title": story_data.get("title", "Untitled"),
-                "narrative": narrative,
-                "genre": story_data.get("genre") or bible.get("genre", "unknown"),
-                "word_count": story_data.get("word_count", len(narrative.split())),
-                "audio_url": story_data.get("audio_url"),
-                "cover_image_url": story_data.get("cover_image_url"),
-                "created_at": row[4],
-                "completed_at": row[5],
-                "generation_time_seconds": row[6],
-                "metadata": result.get("metadata", {}),
-                "email_sent": result.get("email_sent", False)
-            })
-
-        return stories
+        async with self._reader() as conn:
+            if email:
+                cursor = await conn.execute("""
+                    SELECT job_id, user_email, result, story_bible,
+                           created_at, completed_at, generation_time_seconds
+                    FROM story_jobs
+                    WHERE status = 'completed'
+                    AND result IS NOT NULL
+                    AND user_email = ?
+                    ORDER BY completed_at DESC
+                    LIMIT ? OFFSET ?
+                """, (email, limit, offset))
+            else:
+                cursor = await conn.execute("""
+                    SELECT job_id, user_email, result, story_bible,
+                           created_at, completed_at, generation_time_seconds
+                    FROM story_jobs
+                    WHERE status = 'completed'
+                    AND result IS NOT NULL
+                    ORDER BY completed_at DESC
+                    LIMIT ? OFFSET ?
+                """, (limit, offset))
+
+            stories = []
+
+            async for row in cursor:
+                try:
+                    result = json.loads(row["result"]) if row["result"] else {}
+                except (json.JSONDecodeError, TypeError):
+                    # Skip malformed result data
+                    continue
+
+                # Handle different result structures (old vs new format)
+                story_data = result.get("story", {})
+
+                # Fallback: if story_data is empty, try using result directly
+                # (in case old format stored story fields at root level)
+                if not story_data and "narrative" in result:
+                    story_data = result
+
+                try:
+                    bible = json.loads(row["story_bible"]) if row["story_bible"] else {}
+                except (json.JSONDecodeError, TypeError):
+                    bible = {}
+
+                # Only include if we have actual content
+                narrative = story_data.get("narrative", "")
+                if not narrative:
+                    continue
+
+                stories.append({
+                    "job_id": row["job_id"],
+                    "user_email": row["user_email"],
+                    "title": story_data.get("title", "Untitled"),
+                    "narrative": narrative,
+                    "genre": story_data.get("genre") or bible.get("genre", "unknown"),
+                    "word_count": story_data.get("word_count", len(narrative.split())),
+                    "audio_url": story_data.get("audio_url"),
+                    "cover_image_url": story_data.get("cover_image_url"),
+                    "created_at": row["created_at"],
+                    "completed_at": row["completed_at"],
+                    "generation_time_seconds": row["generation_time_seconds"],
+                    "metadata": result.get("metadata", {}),
+                    "email_sent": result.get("email_sent", False)
+                })
+
+            return stories
 
     async def get_story_count(self, email: Optional[str] = None) -> int:
         """Get total count of completed stories."""
-        if email:
-            cursor = await self._conn.execute("""
-                SELECT COUNT(*) FROM story_jobs
-                WHERE status = 'completed' AND result IS NOT NULL AND user_email = ?
-            """, (email,))
-        else:
-            cursor = await self._conn.execute("""
-                SELECT COUNT(*) FROM story_jobs
-                WHERE status = 'completed' AND result IS NOT NULL
-            """)
+        async with self._reader() as conn:
+            if email:
+                cursor = await conn.execute("""
+                    SELECT COUNT(*) FROM story_jobs
+                    WHERE status = 'completed' AND result IS NOT NULL AND user_email = ?
+                """, (email,))
+            else:
+                cursor = await conn.execute("""
+                    SELECT COUNT(*) FROM story_jobs
+                    WHERE status = 'completed' AND result IS NOT NULL
+                """)
+
+            row = await cursor.fetchone()
+            return row[0] if row else 0
+
+    async def cleanup_old_jobs(self, days: int = 30, batch_size: int = 500) -> int:
+        """
+        Remove completed/failed jobs older than specified days.
 
-        row = await cursor.fetchone()
-        return row[0] if row else 0
+        Deletes in batches, committing after each, so the write lock is
+        released between batches and queue inserts aren't stalled behind
+        one large delete.
 
-    async def cleanup_old_jobs(self, days: int = 30):
-        """Remove completed/failed jobs older than specified days"""
-        from datetime import timedelta
-        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        Returns the number of deleted jobs.
+        """
+        cutoff = (_utcnow() - timedelta(days=days)).isoformat()
 
-        await self._conn.execute("""
-            DELETE FROM story_jobs
-            WHERE status IN ('completed', 'failed')
-            AND created_at < ?
-        """, (cutoff,))
-        await self._conn.commit()
+        deleted = 0
+        while True:
+            cursor = await self._conn.execute("""
+                DELETE FROM story_jobs
+                WHERE id IN (
+                    SELECT id FROM story_jobs
+                    WHERE status IN ('completed', 'failed')
+                    AND created_at < ?
+                    LIMIT ?
+                )
+            """, (cutoff, batch_size))
+            await self._conn.commit()
+
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+
+            await asyncio.sleep(0)
+
+        if deleted:
+            # Release a bounded number of free pages (no-op without auto_vacuum).
+            # execute() would step the pragma once and free a single page;
+            # executescript() runs it to completion.
+            await self._conn.executescript("PRAGMA incremental_vacuum(1000);")
+
+        return deleted
 
     async def recover_stale_running_jobs(self, stale_minutes: int = 10) -> int:
         """
@@ -406,8 +555,7 @@ class StoryJobDatabase:
 
         Returns the number of recovered jobs.
         """
-        from datetime import timedelta
-        cutoff = (datetime.utcnow() - timedelta(minutes=stale_minutes)).isoformat()
+        cutoff = (_utcnow() - timedelta(minutes=stale_minutes)).isoformat()
 
         # Find and reset stale running jobs
         cursor = await self._conn.execute("""
@@ -429,5 +577,11 @@ class StoryJobDatabase:
 
     async def close(self):
         """Close database connection"""
+        for reader in self._reader_conns:
+            await reader.close()
+        self._reader_conns.clear()
+        # Drop the closed readers so a later connect() starts a fresh pool
+        self._readers = asyncio.Queue()
         if self._conn:
             await self._conn.close()
+            self._conn = None
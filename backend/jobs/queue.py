@@ -3,11 +3,18 @@ Story job queue manager.
 Provides high-level interface for creating and managing story generation jobs.
 """
 
-import uuid
-from typing import Dict, Any, Optional
+import secrets
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from backend.database.jobs import JobQueueService, JobStatus
 
 
+# Status polls within this window share one database read
+STATUS_CACHE_TTL_SECONDS = 0.5
+STATUS_CACHE_SIZE = 1024
+
+
 class StoryJobQueue:
     """
     High-level interface for the story job queue.
@@ -28,6 +35,7 @@ class StoryJobQueue:
     def __init__(self):
         self.job_service = JobQueueService()
         self._initialized = True  # Supabase client is lazy-loaded
+        self._status_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
     async def initialize(self):
         """Initialize the service (no-op for Supabase, kept for API compatibility)"""
@@ -52,7 +60,7 @@ class StoryJobQueue:
         Returns:
             job_id: Unique identifier for tracking the job
         """
-        job_id = f"story_{uuid.uuid4().hex[:12]}"
+        job_id = f"story_{secrets.token_hex(6)}"
 
         await self.job_service.create_job(
             job_id=job_id,
@@ -62,20 +70,31 @@ class StoryJobQueue:
             user_id=user_id
         )
 
+        # Start it right away if the worker runs in this process
+        from backend.jobs.worker import wake_story_worker
+        wake_story_worker()
+
         return job_id
 
     async def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Get the current status of a job.
 
+        Results are cached for STATUS_CACHE_TTL_SECONDS so several clients
+        polling the same job share one database read.
+
         Returns:
             Dict with status info or None if job not found
         """
-        job = await self.job_service.get_job_by_id(job_id)
+        cached = self._status_cache.get(job_id)
+        if cached and time.monotonic() - cached[0] < STATUS_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        job = await self.job_service.get_job_status(job_id)
         if not job:
             return None
 
-        return {
+        status = {
             "job_id": job["job_id"],
             "status": job["status"],
             "current_step": job.get("current_step"),
@@ -87,6 +106,13 @@ class StoryJobQueue:
             "generation_time_seconds": job.get("generation_time_seconds")
         }
 
+        self._status_cache[job_id] = (time.monotonic(), status)
+        self._status_cache.move_to_end(job_id)
+        if len(self._status_cache) > STATUS_CACHE_SIZE:
+            self._status_cache.popitem(last=False)
+
+        return status
+
     async def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Get the full result of a completed job.
@@ -98,8 +124,7 @@ class StoryJobQueue:
 
     async def get_pending_count(self) -> int:
         """Get the number of pending jobs in the queue"""
-        jobs = await self.job_service.get_pending_jobs(limit=1000)
-        return len(jobs)
+        return await self.job_service.count_pending()
 
     async def get_recent_jobs(
         self,
@@ -111,6 +136,7 @@ class StoryJobQueue:
 
     async def close(self):
         """Close the connection (no-op for Supabase, kept for API compatibility)"""
+        self._status_cache.clear()
         self._initialized = False
 
 
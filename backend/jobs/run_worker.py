@@ -17,7 +17,9 @@ import sys
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from backend.config import config
 from backend.jobs.worker import StoryWorker
+from backend.utils.logging import job_logger as logger
 
 
 async def main():
@@ -26,33 +28,28 @@ async def main():
     print("Starting Standalone Story Worker")
     print("=" * 60)
 
-    # Get database paths from environment or use defaults
-    storage_path = os.getenv("STORAGE_PATH", ".")
-    job_db_path = os.path.join(storage_path, "story_jobs.db") if storage_path != "." else "story_jobs.db"
-    email_db_path = os.path.join(storage_path, "email_scheduler.db") if storage_path != "." else "email_scheduler.db"
-
     poll_interval = int(os.getenv("WORKER_POLL_INTERVAL", "5"))
+    max_concurrency = config.STORY_WORKER_CONCURRENCY
 
-    print(f"  Job database: {job_db_path}")
-    print(f"  Email database: {email_db_path}")
     print(f"  Poll interval: {poll_interval}s")
+    print(f"  Max concurrency: {max_concurrency}")
     print("=" * 60)
 
     worker = StoryWorker(
-        job_db_path=job_db_path,
-        email_db_path=email_db_path,
-        poll_interval_seconds=poll_interval
+        poll_interval_seconds=poll_interval,
+        max_concurrency=max_concurrency
     )
 
-    # Handle shutdown signals gracefully
+    # Handle shutdown signals gracefully (on the loop, not from a raw handler)
     shutdown_event = asyncio.Event()
 
-    def handle_shutdown(signum, frame):
-        print(f"\n  Received signal {signum}, shutting down...")
+    def handle_shutdown(sig: signal.Signals):
+        print(f"\n  Received {sig.name}, shutting down...")
         shutdown_event.set()
 
-    signal.signal(signal.SIGTERM, handle_shutdown)
-    signal.signal(signal.SIGINT, handle_shutdown)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, handle_shutdown, sig)
 
     try:
         await worker.initialize()
@@ -64,16 +61,10 @@ async def main():
         await shutdown_event.wait()
 
     except Exception as e:
-        print(f"  Worker error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Worker error: {e}", error=str(e))
     finally:
         print("\n  Shutting down worker...")
         worker.shutdown()
-        if worker.job_db:
-            await worker.job_db.close()
-        if worker.email_db:
-            await worker.email_db.close()
         print("  Worker stopped.")
 
 
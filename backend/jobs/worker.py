@@ -16,13 +16,26 @@ import os
 import time
 import random
 from datetime import datetime, timezone, timedelta
-from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
+from backend.config import config
+from backend.database.credits import CreditService
+from backend.database.deliveries import DeliveryService
 from backend.database.jobs import JobQueueService, JobStatus
+from backend.database.preshows import PreshowService
+from backend.database.stories import StoryService
+from backend.database.users import UserService
+from backend.storyteller.bible_enhancement import update_story_history
+from backend.storyteller.standalone_generation import generate_standalone_story
 from backend.utils.logging import job_logger as logger
+from backend.utils.retry import is_retryable_error
+from backend.utils.timezones import get_tz, parse_delivery_time
+
+# Attempts at scheduling a saved story's delivery before the job is requeued
+# to retry just the delivery
+DELIVERY_SCHEDULE_ATTEMPTS = 3
 
 
 # Writing room characters and their note templates
@@ -127,14 +140,16 @@ class StoryWorker:
     Email sending is handled by the separate DeliveryWorker.
     """
 
-    def __init__(self, poll_interval_seconds: int = 5):
+    def __init__(self, poll_interval_seconds: int = 5, max_concurrency: int = 1):
         self.poll_interval = poll_interval_seconds
+        self.max_concurrency = max_concurrency
 
         self.scheduler = AsyncIOScheduler()
         self.job_service: JobQueueService | None = None
 
-        self._is_processing = False
-        self._current_job_id: str | None = None
+        # job_id -> task for every job currently being generated
+        self._running: dict[str, asyncio.Task] = {}
+        self.worker_id = f"story-worker-{os.getpid()}"
 
     async def initialize(self):
         """Initialize database connections and recover stale jobs"""
@@ -145,64 +160,65 @@ class StoryWorker:
         if recovered > 0:
             logger.warning(f"Recovered {recovered} stale job(s)", recovered_count=recovered)
 
-        logger.info("Story worker initialized", poll_interval=self.poll_interval)
+        logger.info(
+            "Story worker initialized",
+            poll_interval=self.poll_interval,
+            max_concurrency=self.max_concurrency
+        )
 
     async def process_jobs(self):
         """
         Main job processing loop.
-        Called by scheduler every poll_interval seconds.
+        Called by scheduler every poll_interval seconds (or sooner via wake()).
+
+        Claims as many jobs as there are free slots in one round-trip and
+        runs them as background tasks. Each finished job wakes the worker
+        again, so a deep queue drains without waiting out poll_interval.
         """
-        if self._is_processing:
+        free_slots = self.max_concurrency - len(self._running)
+        if free_slots <= 0:
             return
 
         try:
-            pending = await self.job_service.get_pending_jobs(limit=1)
-            if not pending:
-                return
+            # Fetch + mark running in one atomic round-trip
+            jobs = await self.job_service.claim_pending_batch(self.worker_id, free_slots)
+        except Exception as e:
+            logger.error(f"Worker error: {e}", error=str(e))
+            return
 
-            job = pending[0]
+        for job in jobs:
             job_id = job["job_id"]
-
-            if job.get("retry_count", 0) >= 3:
-                await self.job_service.mark_failed(
-                    job_id,
-                    error_message="Max retries exceeded",
-                    should_retry=False
-                )
-                logger.error(f"Job failed: max retries exceeded", job_id=job_id)
-                return
-
-            self._is_processing = True
-            self._current_job_id = job_id
-
             logger.info(f"Processing job", job_id=job_id, email=job['user_email'])
+            self._running[job_id] = asyncio.create_task(self._run_job(job))
 
+    async def _run_job(self, job: dict):
+        """Run one claimed job, then free its slot and look for more work."""
+        try:
             await self._process_single_job(job)
-
         except Exception as e:
             logger.error(f"Worker error: {e}", error=str(e))
         finally:
-            self._is_processing = False
-            self._current_job_id = None
+            self._running.pop(job["job_id"], None)
+            self.wake()
 
     async def _process_single_job(self, job: dict):
         """Process a single story generation job"""
         job_id = job["job_id"]
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            # Mark as running
-            await self.job_service.update_status(
-                job_id,
-                JobStatus.RUNNING,
-                current_step="starting",
-                progress_percent=0
-            )
+            settings = job.get("settings") or {}
+
+            # The story was generated and saved on an earlier attempt; only
+            # its delivery still needs scheduling
+            if settings.get("pending_delivery"):
+                await self._retry_delivery(job_id, settings)
+                return
 
+            # claim_pending_batch already marked it running at the structure step
             # Extract job data
             story_bible = job["story_bible"]
             user_email = job["user_email"]
-            settings = job.get("settings") or {}
 
             # Get model settings
             writer_model = settings.get("writer_model", "sonnet")
@@ -219,16 +235,6 @@ class StoryWorker:
             user_timezone = settings.get("timezone", "UTC")
             immediate_delivery = settings.get("immediate_delivery", False)
 
-            from backend.storyteller.standalone_generation import generate_standalone_story
-
-            # Update progress: Structure phase
-            await self.job_service.update_status(
-                job_id,
-                JobStatus.RUNNING,
-                current_step="structure",
-                progress_percent=10
-            )
-
             # Run the full generation pipeline
             result = await generate_standalone_story(
                 story_bible=story_bible,
@@ -249,25 +255,14 @@ class StoryWorker:
             updated_bible = result.get("updated_bible", story_bible)  # Get updated bible with name registry
 
             # Update progress: Saving to database
-            await self.job_service.update_status(
-                job_id,
-                JobStatus.RUNNING,
-                current_step="saving",
-                progress_percent=85
-            )
+            await self._report_progress(job_id, "saving", 85)
 
             # Save story and schedule delivery
             story_id = None
             delivery_scheduled = False
+            pending_delivery = None
 
             try:
-                from backend.database.stories import StoryService
-                from backend.database.users import UserService
-                from backend.database.credits import CreditService
-                from backend.database.deliveries import DeliveryService
-                from backend.storyteller.bible_enhancement import update_story_history
-                from backend.config import config
-
                 if config.supabase_configured:
                     user_service = UserService()
                     user = await user_service.get_by_email(user_email)
@@ -320,7 +315,6 @@ class StoryWorker:
                         generate_preshow = settings.get("generate_preshow", False)
                         if generate_preshow and story_id:
                             try:
-                                from backend.database.preshows import PreshowService
                                 preshow_service = PreshowService()
 
                                 # Select variation based on writer
@@ -395,14 +389,6 @@ class StoryWorker:
                             except Exception as credit_error:
                                 logger.error(f"Failed to deduct credits: {credit_error}", error=str(credit_error))
 
-                        # Schedule delivery at user's preferred time
-                        await self.job_service.update_status(
-                            job_id,
-                            JobStatus.RUNNING,
-                            current_step="scheduling_delivery",
-                            progress_percent=95
-                        )
-
                         # Calculate delivery time
                         if immediate_delivery:
                             # For manual admin triggers, send immediately
@@ -419,61 +405,80 @@ class StoryWorker:
                                 user_timezone=user_timezone
                             )
 
-                        delivery_service = DeliveryService()
-                        await delivery_service.schedule_delivery(
-                            story_id=story_id,
-                            user_id=user["id"],
-                            user_email=user_email,
-                            deliver_at=deliver_at,
-                            timezone_str=user_timezone
-                        )
-                        delivery_scheduled = True
-
-                        # Update last_story_at ONLY for daily scheduled stories
-                        # Manual stories are "extras" and don't block the next scheduled story
-                        is_daily = settings.get("is_daily", False)
-                        if is_daily:
-                            try:
-                                await user_service.record_story_delivery(user["id"])
-                                logger.info(
-                                    "Updated last_story_at for daily story",
-                                    user_id=user["id"],
-                                    story_id=story_id
-                                )
-                            except Exception as record_error:
-                                logger.warning(
-                                    f"Failed to update last_story_at: {record_error}",
-                                    user_id=user["id"]
-                                )
+                        delivery = {
+                            "story_id": story_id,
+                            "user_id": user["id"],
+                            "user_email": user_email,
+                            "deliver_at": deliver_at.isoformat(),
+                            "timezone": user_timezone,
+                        }
+                        try:
+                            await self._schedule_delivery(delivery)
+                        except Exception as delivery_error:
+                            if not is_retryable_error(str(delivery_error)):
+                                raise
+                            # The story is saved; requeue the job to retry
+                            # only its delivery (see _retry_delivery)
+                            pending_delivery = delivery
+                            delivery_error_msg = str(delivery_error)
+                        else:
+                            delivery_scheduled = True
+                            await self._record_daily_story(user_service, user["id"], story_id, settings)
 
-                        logger.info(
-                            f"Story saved and delivery scheduled",
-                            story_id=story_id,
-                            deliver_at=deliver_at.isoformat(),
-                            timezone=user_timezone,
-                            immediate=immediate_delivery,
-                            is_daily=is_daily
-                        )
+                            logger.info(
+                                f"Story saved and delivery scheduled",
+                                story_id=story_id,
+                                deliver_at=deliver_at.isoformat(),
+                                timezone=user_timezone,
+                                immediate=immediate_delivery,
+                                is_daily=settings.get("is_daily", False)
+                            )
                     else:
                         logger.warning(f"User not found, story not saved", email=user_email)
                 else:
                     logger.warning("Supabase not configured")
 
             except Exception as save_error:
+                # A transient failure before the story row exists (user lookup,
+                # story insert) loses nothing yet: fail the job so it is
+                # retried. Once the story is saved, retrying would duplicate
+                # it (and its credit charge), so complete without delivery;
+                # transient delivery failures are requeued separately below.
+                if story_id is None and is_retryable_error(str(save_error)):
+                    raise
                 logger.error(f"Failed to save/schedule: {save_error}", error=str(save_error))
 
             # Calculate total time
-            generation_time = time.time() - start_time
+            generation_time = time.perf_counter() - start_time
+
+            job_result = {
+                "story": story,
+                "story_id": story_id,
+                "metadata": result.get("metadata", {}),
+                "delivery_scheduled": delivery_scheduled
+            }
+
+            if pending_delivery:
+                logger.warning(
+                    f"Delivery scheduling failed, requeueing delivery only: {delivery_error_msg}",
+                    job_id=job_id,
+                    story_id=story_id
+                )
+                pending_delivery["generation_time"] = generation_time
+                await self.job_service.mark_failed(
+                    job_id,
+                    error_message=delivery_error_msg,
+                    should_retry=True,
+                    settings={**settings, "pending_delivery": pending_delivery},
+                    result=job_result,
+                    story_id=story_id
+                )
+                return
 
             # Mark completed
             await self.job_service.mark_completed(
                 job_id,
-                result={
-                    "story": story,
-                    "story_id": story_id,
-                    "metadata": result.get("metadata", {}),
-                    "delivery_scheduled": delivery_scheduled
-                },
+                result=job_result,
                 generation_time=generation_time,
                 story_id=story_id
             )
@@ -492,9 +497,7 @@ class StoryWorker:
             error_msg = str(e)
             logger.error(f"Job failed: {error_msg}", job_id=job_id, error=error_msg)
 
-            should_retry = any(x in error_msg.lower() for x in [
-                "timeout", "rate limit", "429", "503", "502", "connection"
-            ])
+            should_retry = is_retryable_error(error_msg)
 
             await self.job_service.mark_failed(
                 job_id,
@@ -502,6 +505,97 @@ class StoryWorker:
                 should_retry=should_retry
             )
 
+    async def _schedule_delivery(self, delivery: dict):
+        """
+        Schedule a story's delivery, retrying transient failures in place.
+
+        schedule_delivery upserts on story_id, so repeating it is safe.
+        """
+        delivery_service = DeliveryService()
+        for attempt in range(DELIVERY_SCHEDULE_ATTEMPTS):
+            try:
+                return await delivery_service.schedule_delivery(
+                    story_id=delivery["story_id"],
+                    user_id=delivery["user_id"],
+                    user_email=delivery["user_email"],
+                    deliver_at=datetime.fromisoformat(delivery["deliver_at"]),
+                    timezone_str=delivery["timezone"]
+                )
+            except Exception as e:
+                if attempt == DELIVERY_SCHEDULE_ATTEMPTS - 1 or not is_retryable_error(str(e)):
+                    raise
+                logger.warning(
+                    f"Delivery scheduling attempt {attempt + 1} failed, retrying...",
+                    error=str(e),
+                    story_id=delivery["story_id"]
+                )
+                await asyncio.sleep(2 ** attempt)
+
+    async def _record_daily_story(
+        self,
+        user_service: UserService,
+        user_id: str,
+        story_id: str,
+        settings: dict
+    ):
+        """Update last_story_at, but ONLY for daily scheduled stories.
+
+        Manual stories are "extras" and don't block the next scheduled story.
+        """
+        if not settings.get("is_daily", False):
+            return
+        try:
+            await user_service.record_story_delivery(user_id)
+            logger.info(
+                "Updated last_story_at for daily story",
+                user_id=user_id,
+                story_id=story_id
+            )
+        except Exception as record_error:
+            logger.warning(
+                f"Failed to update last_story_at: {record_error}",
+                user_id=user_id
+            )
+
+    async def _retry_delivery(self, job_id: str, settings: dict):
+        """Schedule the delivery of a story saved by an earlier attempt of this job."""
+        delivery = settings["pending_delivery"]
+        await self._report_progress(job_id, "scheduling", 90)
+
+        # Failures propagate to _process_single_job, which requeues the job
+        # with its settings (and so this delivery-only marker) untouched
+        await self._schedule_delivery(delivery)
+        await self._record_daily_story(UserService(), delivery["user_id"], delivery["story_id"], settings)
+
+        job_row = await self.job_service.get_job_by_id(job_id)
+        job_result = dict((job_row or {}).get("result") or {})
+        job_result["delivery_scheduled"] = True
+
+        await self.job_service.mark_completed(
+            job_id,
+            result=job_result,
+            generation_time=delivery.get("generation_time", 0.0),
+            story_id=delivery["story_id"]
+        )
+        logger.info(
+            "Delivery scheduled on retry",
+            job_id=job_id,
+            story_id=delivery["story_id"],
+            deliver_at=delivery["deliver_at"]
+        )
+
+    async def _report_progress(self, job_id: str, current_step: str, progress_percent: int):
+        """Best-effort progress update; a failed ping shouldn't fail the job."""
+        try:
+            await self.job_service.update_status(
+                job_id,
+                JobStatus.RUNNING,
+                current_step=current_step,
+                progress_percent=progress_percent
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update job progress: {e}", job_id=job_id, step=current_step)
+
     def _calculate_delivery_time(
         self,
         delivery_time: str,
@@ -512,18 +606,8 @@ class StoryWorker:
 
         If the delivery time has already passed today, schedule for tomorrow.
         """
-        try:
-            tz = ZoneInfo(user_timezone)
-        except Exception:
-            tz = ZoneInfo("UTC")
-
-        # Parse delivery time (HH:MM)
-        try:
-            parts = delivery_time.split(":")
-            target_hour = int(parts[0])
-            target_minute = int(parts[1])
-        except (ValueError, IndexError):
-            target_hour, target_minute = 8, 0
+        tz = get_tz(user_timezone)
+        target_hour, target_minute = parse_delivery_time(delivery_time)
 
         # Get current time in user's timezone
         now_utc = datetime.now(timezone.utc)
@@ -558,6 +642,16 @@ class StoryWorker:
         self.scheduler.start()
         logger.info(f"Story worker started", poll_interval=self.poll_interval)
 
+    def wake(self):
+        """
+        Run the next poll now instead of waiting out the interval.
+
+        Called after a job is enqueued in this process so it starts within
+        milliseconds; the interval poll still catches jobs queued elsewhere.
+        """
+        if self.scheduler.running:
+            self.scheduler.modify_job("story_worker", next_run_time=datetime.now(timezone.utc))
+
     def shutdown(self):
         """Shutdown the worker"""
         if self.scheduler.running:
@@ -566,28 +660,44 @@ class StoryWorker:
 
     @property
     def is_processing(self) -> bool:
-        """Check if worker is currently processing a job"""
-        return self._is_processing
+        """Check if worker is currently processing any job"""
+        return bool(self._running)
 
     @property
     def current_job(self) -> str | None:
-        """Get the ID of the currently processing job"""
-        return self._current_job_id
+        """Get the ID of a currently processing job (the oldest one)"""
+        return next(iter(self._running), None)
+
+    @property
+    def current_jobs(self) -> list[str]:
+        """Get the IDs of all currently processing jobs"""
+        return list(self._running)
 
 
 # Global worker instance
 _worker_instance: StoryWorker | None = None
 
 
-async def start_story_worker(poll_interval: int = 5):
+async def start_story_worker(poll_interval: int = 30, max_concurrency: int | None = None):
     """
     Start the background story worker.
     Call this during FastAPI startup.
+
+    Jobs queued in this process wake the worker directly (wake_story_worker),
+    so poll_interval is only a fallback for jobs inserted elsewhere.
+
+    max_concurrency defaults to config.STORY_WORKER_CONCURRENCY.
     """
     global _worker_instance
 
     if _worker_instance is None:
-        _worker_instance = StoryWorker(poll_interval_seconds=poll_interval)
+        if max_concurrency is None:
+            max_concurrency = config.STORY_WORKER_CONCURRENCY
+
+        _worker_instance = StoryWorker(
+            poll_interval_seconds=poll_interval,
+            max_concurrency=max_concurrency
+        )
         await _worker_instance.initialize()
         _worker_instance.start()
 
@@ -604,6 +714,15 @@ def stop_story_worker():
         _worker_instance = None
 
 
+def wake_story_worker():
+    """Nudge the in-process worker (if running) to poll for new jobs now."""
+    if _worker_instance is not None:
+        try:
+            _worker_instance.wake()
+        except Exception as e:
+            logger.warning(f"Failed to wake story worker: {e}", error=str(e))
+
+
 def get_worker() -> StoryWorker | None:
     """Get the current worker instance (for status checks)"""
     return _worker_instance
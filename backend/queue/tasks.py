@@ -57,7 +57,7 @@ async def _generate_story_async(
     from backend.utils.logging import job_logger as logger
 
     job_service = JobQueueService()
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
         # Mark as running
@@ -212,7 +212,7 @@ async def _generate_story_async(
                 )
 
         # Calculate total time
-        generation_time = time.time() - start_time
+        generation_time = time.perf_counter() - start_time
 
         # Mark completed
         await job_service.mark_completed(
@@ -244,7 +244,7 @@ async def _generate_story_async(
         }
 
     except Exception as e:
-        generation_time = time.time() - start_time
+        generation_time = time.perf_counter() - start_time
         error_msg = str(e)
 
         logger.error(f"Job failed: {error_msg}", job_id=job_id, error=error_msg)
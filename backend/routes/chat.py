@@ -13,7 +13,7 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from backend.config import config
-from backend.fixion import FixionService, FIXION_PERSONAS
+from backend.fixion import FixionService, FIXION_PERSONAS, resolve_genre
 from backend.routes.auth import get_current_user_id
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
@@ -210,7 +210,7 @@ async def select_genre(
 
     Fixion will pivot to the genre-specific persona.
     """
-    if request.genre.lower() not in FIXION_PERSONAS:
+    if resolve_genre(request.genre) is None:
         available = list(FIXION_PERSONAS.keys())
         raise HTTPException(
             status_code=400,
@@ -277,8 +277,8 @@ async def get_available_genres():
         "genres": [
             {
                 "id": genre_id,
-                "name": data["name"],
-                "description": data.get("character_note", ""),
+                "name": data.name,
+                "description": data.character_note or "",
             }
             for genre_id, data in FIXION_PERSONAS.items()
         ]
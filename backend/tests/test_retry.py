@@ -0,0 +1,45 @@
+"""
+Tests for the shared retryable-error classifier.
+
+Run with: python -m pytest backend/tests/test_retry.py -v
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.utils.retry import is_retryable_error
+
+
+class TestIsRetryableError:
+    """Tests for is_retryable_error."""
+
+    @pytest.mark.parametrize("message", [
+        "Request timeout after 30s",
+        "Read Timeout",
+        "rate limit exceeded",
+        "Rate_limit_error",
+        "rate-limit hit",
+        "ratelimit",
+        "HTTP 429 Too Many Requests",
+        "503 Service Unavailable",
+        "502 Bad Gateway",
+        "Connection reset by peer",
+    ])
+    def test_transient_errors_are_retryable(self, message):
+        """Timeouts, rate limits, gateway errors and dropped connections retry."""
+        assert is_retryable_error(message)
+
+    @pytest.mark.parametrize("message", [
+        "",
+        "400 Bad Request",
+        "Invalid API key",
+        "User not found",
+        "duplicate key value violates unique constraint",
+        "Unknown generation error",
+    ])
+    def test_permanent_errors_are_not_retryable(self, message):
+        """Anything else is treated as a permanent failure."""
+        assert not is_retryable_error(message)
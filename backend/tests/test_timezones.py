@@ -0,0 +1,49 @@
+"""
+Tests for the shared timezone and delivery-time helpers.
+
+Run with: python -m pytest backend/tests/test_timezones.py -v
+"""
+
+from datetime import timezone
+from pathlib import Path
+import sys
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.utils.timezones import get_tz, parse_delivery_time
+
+
+class TestGetTz:
+    """Tests for get_tz."""
+
+    def test_valid_zone(self):
+        """A valid IANA name resolves to that zone."""
+        assert get_tz("America/New_York") == ZoneInfo("America/New_York")
+
+    def test_utc_and_empty_values(self):
+        """UTC, empty and missing values all resolve to UTC."""
+        assert get_tz("UTC") is timezone.utc
+        assert get_tz("") is timezone.utc
+        assert get_tz(None) is timezone.utc
+
+    def test_invalid_zone_falls_back_to_utc(self):
+        """Unknown or malformed zone names fall back to UTC."""
+        assert get_tz("Bad/Zone") is timezone.utc
+        assert get_tz("not a zone") is timezone.utc
+
+
+class TestParseDeliveryTime:
+    """Tests for parse_delivery_time."""
+
+    def test_valid_times(self):
+        """HH:MM strings parse to (hour, minute)."""
+        assert parse_delivery_time("07:30") == (7, 30)
+        assert parse_delivery_time("23:05") == (23, 5)
+
+    def test_invalid_times_fall_back_to_default(self):
+        """Unparseable values fall back to 8:00 AM."""
+        assert parse_delivery_time("bad") == (8, 0)
+        assert parse_delivery_time("") == (8, 0)
+        assert parse_delivery_time("7") == (8, 0)
+        assert parse_delivery_time("ab:cd") == (8, 0)
@@ -12,6 +12,8 @@ from backend.utils.logging import (
     auth_logger,
     api_logger,
 )
+from backend.utils.retry import is_retryable_error
+from backend.utils.timezones import get_tz, parse_delivery_time
 
 __all__ = [
     "get_logger",
@@ -24,4 +26,7 @@ __all__ = [
     "email_logger",
     "auth_logger",
     "api_logger",
+    "is_retryable_error",
+    "get_tz",
+    "parse_delivery_time",
 ]
@@ -155,7 +155,8 @@ class AppLogger:
         self,
         level: LogLevel,
         message: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        exc_info: bool = False,
     ):
         """Internal method to log to both destinations."""
         # Add to buffer
@@ -165,7 +166,7 @@ class AppLogger:
         # Also log to Python logging
         log_level = getattr(logging, level.value.upper())
         extra_msg = f" | {metadata}" if metadata else ""
-        self._logger.log(log_level, f"{message}{extra_msg}")
+        self._logger.log(log_level, f"{message}{extra_msg}", exc_info=exc_info)
 
     def debug(self, message: str, **metadata):
         self._log(LogLevel.DEBUG, message, metadata if metadata else None)
@@ -182,6 +183,10 @@ class AppLogger:
     def critical(self, message: str, **metadata):
         self._log(LogLevel.CRITICAL, message, metadata if metadata else None)
 
+    def exception(self, message: str, **metadata):
+        """Log an error with the active exception's traceback (call from an except block)."""
+        self._log(LogLevel.ERROR, message, metadata if metadata else None, exc_info=True)
+
 
 def get_logger(source: str) -> AppLogger:
     """Get an AppLogger for a specific source/module."""
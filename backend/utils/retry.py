@@ -0,0 +1,16 @@
+"""
+Retry classification shared by the background workers.
+
+The story worker and the delivery worker both decide whether a failed job
+is worth retrying; keeping the rule here stops the two policies drifting.
+"""
+
+import re
+
+# Transient failures worth retrying, matched in one case-insensitive pass
+_RETRYABLE_ERROR_RE = re.compile(r"timeout|rate[ _-]?limit|429|503|502|connection", re.IGNORECASE)
+
+
+def is_retryable_error(message: str) -> bool:
+    """Whether an error message looks like a transient (retryable) failure."""
+    return _RETRYABLE_ERROR_RE.search(message) is not None
@@ -0,0 +1,32 @@
+"""
+Timezone and delivery-time helpers shared by the story scheduler and worker.
+
+Both resolve the same per-user settings (IANA timezone name, "HH:MM"
+delivery time) for every user/job, so the parsed values are cached.
+"""
+
+from datetime import timezone, tzinfo
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+
+@lru_cache(maxsize=512)
+def get_tz(user_timezone: Optional[str]) -> tzinfo:
+    """Resolve an IANA timezone name, falling back to UTC if it's invalid."""
+    if not user_timezone or user_timezone == "UTC":
+        return timezone.utc
+    try:
+        return ZoneInfo(user_timezone)
+    except Exception:
+        return timezone.utc
+
+
+@lru_cache(maxsize=256)
+def parse_delivery_time(time_str: str) -> tuple[int, int]:
+    """Parse HH:MM string to (hour, minute) tuple, defaulting to 8:00 AM."""
+    try:
+        parts = time_str.split(":")
+        return int(parts[0]), int(parts[1])
+    except (ValueError, IndexError):
+        return 8, 0
@@ -0,0 +1,61 @@
+-- Batch job claiming
+-- Lets a worker claim several pending jobs in one round-trip so it can run
+-- them concurrently (same locking semantics as claim_pending_job)
+
+-- Claiming skips jobs with retry_count >= 3 and mark_failed now fails those
+-- outright; fail any left pending by the old retry path so they don't sit
+-- in the queue (and in pending counts) forever
+UPDATE public.story_jobs
+SET
+    status = 'failed',
+    error_message = COALESCE(error_message, 'Max retries exceeded'),
+    completed_at = NOW()
+WHERE status = 'pending'
+  AND retry_count >= 3;
+
+CREATE OR REPLACE FUNCTION public.claim_pending_jobs(worker_id TEXT, batch_size INTEGER)
+RETURNS TABLE (
+    id UUID,
+    job_id TEXT,
+    story_bible JSONB,
+    user_email TEXT,
+    settings JSONB,
+    created_at TIMESTAMP WITH TIME ZONE,
+    retry_count INTEGER
+) AS $$
+BEGIN
+    -- FOR UPDATE SKIP LOCKED: concurrent workers split the queue instead of
+    -- blocking on (or double-claiming) the same rows
+    RETURN QUERY
+    UPDATE public.story_jobs sj
+    SET
+        status = 'running',
+        claimed_by = worker_id,
+        claimed_at = NOW(),
+        started_at = NOW(),
+        -- Claimed jobs go straight into generation; setting the first
+        -- progress step here saves the worker a separate status write
+        current_step = 'structure',
+        progress_percent = 10
+    WHERE sj.id IN (
+        SELECT sj2.id
+        FROM public.story_jobs sj2
+        WHERE sj2.status = 'pending'
+          AND sj2.retry_count < 3
+        ORDER BY sj2.created_at ASC
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING
+        sj.id,
+        sj.job_id,
+        sj.story_bible,
+        sj.user_email,
+        sj.settings,
+        sj.created_at,
+        sj.retry_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION public.claim_pending_jobs IS
+    'Atomically claim up to batch_size pending jobs (oldest first) for a worker. Uses FOR UPDATE SKIP LOCKED to prevent race conditions.';
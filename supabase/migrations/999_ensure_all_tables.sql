@@ -114,6 +114,18 @@ CREATE TABLE IF NOT EXISTS public.scheduled_deliveries (
     updated_at timestamp with time zone NOT NULL DEFAULT now()
 );
 
+-- One delivery per story (same constraint as 006_fix_duplicate_deliveries);
+-- DeliveryService.schedule_delivery relies on it for ON CONFLICT (story_id)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'unique_story_delivery'
+    ) THEN
+        ALTER TABLE public.scheduled_deliveries
+            ADD CONSTRAINT unique_story_delivery UNIQUE (story_id);
+    END IF;
+END $$;
+
 -- =====================================================
 -- 5. CHARACTER_NAMES TABLE
 -- =====================================================